@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""Archive, hashing and copy helpers for AIONBD state backups."""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import tarfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    from report_io import write_bytes_atomic
+except ModuleNotFoundError:
+    from scripts.report_io import write_bytes_atomic
+
+COPY_BUFFER_BYTES = 1024 * 1024
+ZSTD_LEVEL = 3
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+ARCHIVE_SUFFIXES = {"gzip": ".tar.gz", "zstd": ".tar.zst"}
+HASH_CACHE_NAME = ".hash_cache.json"
+
+
+def require_zstandard() -> None:
+    if zstandard is None:
+        raise RuntimeError("zstd compression requires the zstandard package")
+
+
+@contextmanager
+def open_archive_writer(output: Path, compression: str) -> Iterator[tarfile.TarFile]:
+    """Open `output` as a tar archive compressed with gzip or (multithreaded) zstd."""
+    if compression == "gzip":
+        with tarfile.open(output, mode="w:gz", copybufsize=COPY_BUFFER_BYTES) as archive:
+            yield archive
+        return
+    require_zstandard()
+    compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=-1)
+    with output.open("wb") as raw, compressor.stream_writer(raw) as writer:
+        with tarfile.open(fileobj=writer, mode="w|", copybufsize=COPY_BUFFER_BYTES) as archive:
+            yield archive
+
+
+@contextmanager
+def open_archive_reader(path: Path) -> Iterator[tarfile.TarFile]:
+    """Open a backup archive for one sequential pass, detecting zstd by its magic."""
+    with path.open("rb") as raw:
+        is_zstd = raw.read(len(ZSTD_MAGIC)) == ZSTD_MAGIC
+        raw.seek(0)
+        if not is_zstd:
+            with tarfile.open(fileobj=raw, mode="r:gz") as archive:
+                yield archive
+            return
+        require_zstandard()
+        with zstandard.ZstdDecompressor().stream_reader(raw) as reader:
+            with tarfile.open(fileobj=reader, mode="r|") as archive:
+                yield archive
+
+
+class HashingReader:
+    """Read-only file wrapper that feeds every byte it returns into sha256."""
+
+    def __init__(self, handle: BinaryIO) -> None:
+        self._handle = handle
+        self._hasher = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._handle.read(size)
+        self._hasher.update(data)
+        return data
+
+    def hexdigest(self) -> str:
+        return self._hasher.hexdigest()
+
+
+class HashingWriter:
+    """Write-only file wrapper that feeds every byte it writes into sha256."""
+
+    def __init__(self, handle: BinaryIO) -> None:
+        self._handle = handle
+        self._hasher = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self._hasher.update(data)
+        return self._handle.write(data)
+
+    def hexdigest(self) -> str:
+        return self._hasher.hexdigest()
+
+
+class HashCache:
+    """sha256 digests from the previous backup, keyed by path and (mtime_ns, size).
+
+    Only entries looked up or stored during this run are saved back, so digests
+    of compacted-away incremental segments do not accumulate.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        try:
+            previous = json.loads(path.read_bytes())
+        except (OSError, ValueError):
+            previous = {}
+        self._previous = previous if isinstance(previous, dict) else {}
+        self._current: dict[str, list[object]] = {}
+
+    def lookup(self, key: str, stat: os.stat_result) -> str | None:
+        entry = self._previous.get(key)
+        if (
+            isinstance(entry, list)
+            and len(entry) == 3
+            and entry[0] == stat.st_mtime_ns
+            and entry[1] == stat.st_size
+            and isinstance(entry[2], str)
+        ):
+            self._current[key] = entry
+            return entry[2]
+        return None
+
+    def store(self, key: str, stat: os.stat_result, digest: str) -> None:
+        self._current[key] = [stat.st_mtime_ns, stat.st_size, digest]
+
+    def save(self) -> None:
+        write_bytes_atomic(self.path, json.dumps(self._current).encode("utf-8"))
+
+
+def add_hashed_file(
+    archive: tarfile.TarFile,
+    path: Path,
+    arcname: str,
+    cache: HashCache | None = None,
+) -> dict[str, object]:
+    """Stream one file into the archive, hashing the exact bytes written.
+
+    When `cache` holds a digest for the file's current mtime and size, the
+    bytes are copied without being hashed again. Returns the manifest entry.
+    """
+    with path.open("rb") as handle:
+        info = archive.gettarinfo(arcname=arcname, fileobj=handle)
+        stat = os.fstat(handle.fileno())
+        key = str(path.resolve())
+        digest = cache.lookup(key, stat) if cache is not None else None
+        if digest is not None:
+            archive.addfile(info, handle)
+        else:
+            reader = HashingReader(handle)
+            archive.addfile(info, reader)
+            digest = reader.hexdigest()
+            if cache is not None:
+                cache.store(key, stat, digest)
+    return {"path": arcname, "size_bytes": info.size, "sha256": digest}
+
+
+def add_bytes_member(archive: tarfile.TarFile, name: str, data: bytes) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = int(time.time())
+    info.mode = 0o644
+    archive.addfile(info, io.BytesIO(data))
+
+
+def verify_archive_files(
+    manifest: dict[str, object], extracted: dict[str, tuple[int, str]]
+) -> None:
+    """Check manifest entries against the sizes/digests recorded during extraction."""
+    entries = manifest["entries"]
+    assert isinstance(entries, list)
+
+    for entry in entries:
+        if not isinstance(entry, dict):
+            raise ValueError("manifest entry must be an object")
+
+        relative = entry.get("path")
+        expected_size = entry.get("size_bytes")
+        expected_hash = entry.get("sha256")
+        if not isinstance(relative, str):
+            raise ValueError("manifest entry path must be a string")
+        if not isinstance(expected_size, int):
+            raise ValueError("manifest entry size_bytes must be an int")
+        if not isinstance(expected_hash, str):
+            raise ValueError("manifest entry sha256 must be a string")
+
+        actual = extracted.get(PurePosixPath(relative).as_posix())
+        if actual is None:
+            raise ValueError(f"archive entry is missing: {relative}")
+
+        actual_size, actual_hash = actual
+        if actual_size != expected_size:
+            raise ValueError(
+                f"size mismatch for {relative}: actual={actual_size} expected={expected_size}"
+            )
+        if actual_hash != expected_hash:
+            raise ValueError(
+                f"sha256 mismatch for {relative}: actual={actual_hash} expected={expected_hash}"
+            )
+
+
+def safe_extract_archive(
+    archive: tarfile.TarFile, destination: Path
+) -> dict[str, tuple[int, str]]:
+    """Extract dirs and regular files in one sequential pass.
+
+    File bytes are hashed as they are written, so verification never re-reads
+    them; returns `{member path: (size, sha256)}`. Works on streamed (zstd)
+    archives too. The destination is a throwaway staging dir, so a rejection
+    part-way through is harmless.
+    """
+    destination_root = destination.resolve()
+    extracted: dict[str, tuple[int, str]] = {}
+    for member in archive:
+        target = (destination / member.name).resolve()
+        if not target.is_relative_to(destination_root):
+            raise ValueError(f"archive contains unsafe path: {member.name}")
+        if member.isdir():
+            target.mkdir(parents=True, exist_ok=True)
+            continue
+        if not member.isfile():
+            raise ValueError(f"archive contains unsupported member: {member.name}")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        source = archive.extractfile(member)
+        assert source is not None
+        with target.open("wb") as handle:
+            writer = HashingWriter(handle)
+            shutil.copyfileobj(source, writer, COPY_BUFFER_BYTES)
+        os.chmod(target, member.mode & 0o777)
+        os.utime(target, (member.mtime, member.mtime))
+        size = os.stat(target).st_size
+        extracted[PurePosixPath(member.name).as_posix()] = (size, writer.hexdigest())
+    return extracted
+
+
+def copy_file(src: str | os.PathLike[str], dst: str | os.PathLike[str]) -> str:
+    """Copy contents with copy_file_range (in-kernel, reflink where supported).
+
+    Falls back to buffered copying from the current offsets when the call is
+    unavailable or the filesystem pair rejects it, then copies metadata like
+    `shutil.copy2`. Usable as a `shutil.copytree` copy_function.
+    """
+    with open(src, "rb") as source, open(dst, "wb") as target:
+        if hasattr(os, "copy_file_range"):
+            remaining = os.fstat(source.fileno()).st_size
+            try:
+                while remaining > 0:
+                    copied = os.copy_file_range(
+                        source.fileno(), target.fileno(), remaining
+                    )
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            except OSError:
+                pass
+        shutil.copyfileobj(source, target, COPY_BUFFER_BYTES)
+    shutil.copystat(src, dst)
+    return str(dst)
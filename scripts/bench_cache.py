@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Stream benchmark command stdout, with an opt-in cache keyed by command and tree."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+
+try:
+    from path_guard import resolve_io_path
+    from report_io import write_bytes_atomic
+except ModuleNotFoundError:
+    from scripts.path_guard import resolve_io_path
+    from scripts.report_io import write_bytes_atomic
+
+CACHE_ENABLE_ENV = "AIONBD_BENCH_CACHE"
+CACHE_DIR_ENV = "AIONBD_BENCH_CACHE_DIR"
+DEFAULT_CACHE_DIR = "bench/reports/cache"
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _git(*args: str) -> bytes:
+    return subprocess.run(
+        ["git", *args], cwd=REPO_ROOT, capture_output=True, check=True
+    ).stdout
+
+
+def source_fingerprint(exclude_dir: Path) -> dict[str, str] | None:
+    """Return the git HEAD and a hash of uncommitted changes, or None outside git.
+
+    Uncommitted changes cover the tracked diff plus the names and contents of
+    untracked, non-ignored files; files under `exclude_dir` (the cache) are
+    skipped so storing an entry does not change the key.
+    """
+    try:
+        head = _git("rev-parse", "HEAD").decode("utf-8").strip()
+        diff = _git("diff", "HEAD", "--binary")
+        untracked = _git("ls-files", "--others", "--exclude-standard", "-z")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    digest = hashlib.sha256(diff)
+    for name in sorted(filter(None, untracked.split(b"\0"))):
+        path = REPO_ROOT / os.fsdecode(name)
+        if path.is_relative_to(exclude_dir):
+            continue
+        try:
+            content = path.read_bytes()
+        except OSError:
+            continue
+        digest.update(name + b"\0" + hashlib.sha256(content).digest())
+    return {"head": head, "changes": digest.hexdigest()}
+
+
+def bench_cache_path(command: list[str], env: Mapping[str, str]) -> Path | None:
+    """Return the cache file for `command`, or None unless AIONBD_BENCH_CACHE=1.
+
+    The key covers the source tree too, so edits to the bench or engine miss the
+    cache; outside a git checkout caching is skipped.
+    """
+    if os.environ.get(CACHE_ENABLE_ENV, "").strip() != "1":
+        return None
+    cache_dir = resolve_io_path(
+        os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR), label=CACHE_DIR_ENV
+    )
+    source = source_fingerprint(cache_dir)
+    if source is None:
+        return None
+    key_material = json.dumps(
+        {
+            "cmd": command,
+            "env": {key: value for key, value in env.items() if key.startswith("AIONBD_")},
+            "source": source,
+        },
+        sort_keys=True,
+    )
+    key = hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+    return cache_dir / f"{key}.stdout"
+
+
+def load_cached_stdout(path: Path | None) -> list[str] | None:
+    if path is None or not path.is_file():
+        return None
+    return path.read_text(encoding="utf-8").splitlines(keepends=True)
+
+
+def store_cached_stdout(path: Path, lines: list[str]) -> None:
+    write_bytes_atomic(path, "".join(lines).encode("utf-8"))
+
+
+def stream_command_stdout(
+    command: list[str], env: Mapping[str, str], *, label: str
+) -> Iterator[str]:
+    """Yield stdout lines as they arrive, echoing them; stderr is pumped through."""
+    with subprocess.Popen(
+        command,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=1,
+    ) as process:
+        assert process.stdout is not None and process.stderr is not None
+        stderr_pump = threading.Thread(
+            target=shutil.copyfileobj,
+            args=(process.stderr, sys.stderr),
+            daemon=True,
+        )
+        stderr_pump.start()
+        for line in process.stdout:
+            sys.stdout.write(line)
+            yield line
+        stderr_pump.join()
+    if process.returncode != 0:
+        raise RuntimeError(f"{label} command failed")
+
+
+def iter_bench_stdout(
+    command: list[str], env: Mapping[str, str], *, label: str, row_prefix: str
+) -> Iterator[str]:
+    """Yield bench stdout lines from the cache when enabled and warm, else live.
+
+    A live run is cached only if it printed at least one `row_prefix` line.
+    """
+    cache_file = bench_cache_path(command, env)
+    cached = load_cached_stdout(cache_file)
+    if cached is not None:
+        print(f"bench_cache=hit path={cache_file}", file=sys.stderr)
+        for line in cached:
+            sys.stdout.write(line)
+            yield line
+        return
+
+    captured: list[str] = []
+    for line in stream_command_stdout(command, env, label=label):
+        if cache_file is not None:
+            captured.append(line)
+        yield line
+    if cache_file is not None and any(line.startswith(row_prefix) for line in captured):
+        store_cached_stdout(cache_file, captured)
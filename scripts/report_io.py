@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Shared JSON encoding helpers for benchmark and load report scripts."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_json(payload: Any) -> bytes:
+    """Encode a report payload as indented UTF-8 JSON (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    return json.dumps(payload, indent=2, sort_keys=False).encode("utf-8")
+
+
+def loads_json(data: bytes) -> Any:
+    """Decode UTF-8 JSON bytes without an intermediate str (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def utc_now_iso(*, with_micros: bool = True) -> str:
+    """Current UTC time formatted like `datetime.now(timezone.utc).isoformat()`.
+
+    `with_micros=False` matches `isoformat(timespec="seconds")`.
+    """
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+    if not with_micros:
+        return f"{stamp}+00:00"
+    return f"{stamp}.{nanos // 1000:06d}+00:00"
+
+
+def write_bytes_atomic(path: Path, data: bytes) -> None:
+    """Write `data` to a sibling temp file, fsync it, then rename it over `path`.
+
+    The temp file is removed if any step fails, so `path` is either the old
+    content or the complete new one.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with open(tmp_path, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
@@ -4,19 +4,30 @@
 from __future__ import annotations
 
 import argparse
-import json
+import functools
 import os
 import subprocess
 import sys
-import tempfile
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 try:
-    from path_guard import resolve_io_path
+    from path_guard import TEMP_ROOT, WORKSPACE_ROOT, resolve_io_path
+    from report_io import (
+        dumps_json,
+        loads_json,
+        utc_now_iso,
+        write_bytes_atomic,
+    )
 except ModuleNotFoundError:
-    from scripts.path_guard import resolve_io_path
+    from scripts.path_guard import TEMP_ROOT, WORKSPACE_ROOT, resolve_io_path
+    from scripts.report_io import (
+        dumps_json,
+        loads_json,
+        utc_now_iso,
+        write_bytes_atomic,
+    )
 
 SOAK_SCRIPT = Path(__file__).resolve().parent / "run_soak_test.py"
 REQUIRED_FIELDS = (
@@ -33,6 +44,14 @@ REQUIRED_FIELDS = (
     "write_ops",
 )
 SOAK_STRICT_MAX_ERROR_RATE = 1.0
+RESULTS_TABLE_HEADER = (
+    "| total_ops | read_ops | write_ops | error_rate | throughput_ops_s | p50_us | p95_us | p99_us |\n"
+    "|---:|---:|---:|---:|---:|---:|---:|---:|"
+)
+RESULTS_ROW_FMT = (
+    "| {total_ops:d} | {read_ops:d} | {write_ops:d} | {error_rate:.6f} | "
+    "{throughput:.3f} | {p50:d} | {p95:d} | {p99:d} |"
+)
 
 
 def _is_within(path: Path, root: Path) -> bool:
@@ -40,20 +59,56 @@ def _is_within(path: Path, root: Path) -> bool:
 
 
 def ensure_trusted_io_path(path: Path, *, label: str, must_exist: bool = False) -> Path:
-    """Re-validate path close to sink operations for static and runtime safety."""
+    """Re-validate path close to sink operations for static and runtime safety.
+
+    Trusted roots come from `path_guard`, which captures the working directory
+    and temp directory once at import time.
+    """
     resolved = path.resolve()
-    workspace_root = Path.cwd().resolve()
-    temp_root = Path(tempfile.gettempdir()).resolve()
-    if not (_is_within(resolved, workspace_root) or _is_within(resolved, temp_root)):
+    if not (_is_within(resolved, WORKSPACE_ROOT) or _is_within(resolved, TEMP_ROOT)):
         raise ValueError(
-            f"{label} must stay under '{workspace_root}' or '{temp_root}': {resolved}"
+            f"{label} must stay under '{WORKSPACE_ROOT}' or '{TEMP_ROOT}': {resolved}"
         )
     if must_exist and not resolved.exists():
         raise FileNotFoundError(f"{label} does not exist: {resolved}")
     return resolved
 
 
-def parse_args() -> argparse.Namespace:
+# Options whose defaults come from the environment. They are resolved at
+# parse time (not when the cached parser is built) so env changes still apply.
+ENV_DEFAULTS: tuple[tuple[str, str, str, Callable[[str], Any]], ...] = (
+    ("strict_max_error_rate", "AIONBD_MVP_LOAD_MAX_ERROR_RATE", "0.05", float),
+    ("strict_max_latency_us_p95", "AIONBD_MVP_LOAD_MAX_LATENCY_US_P95", "300000", int),
+    ("strict_max_latency_us_p99", "AIONBD_MVP_LOAD_MAX_LATENCY_US_P99", "600000", int),
+    (
+        "strict_min_throughput_ops_per_second",
+        "AIONBD_MVP_LOAD_MIN_THROUGHPUT_OPS_PER_SECOND",
+        "20",
+        float,
+    ),
+    (
+        "report_path",
+        "AIONBD_MVP_LOAD_REPORT_PATH",
+        "bench/reports/mvp_load_profile_report.md",
+        str,
+    ),
+    (
+        "report_json_path",
+        "AIONBD_MVP_LOAD_REPORT_JSON_PATH",
+        "bench/reports/mvp_load_profile_report.json",
+        str,
+    ),
+    (
+        "raw_report_path",
+        "AIONBD_MVP_LOAD_RAW_REPORT_PATH",
+        "bench/reports/mvp_load_profile_raw.json",
+        str,
+    ),
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Run MVP load profile and evaluate thresholds"
     )
@@ -71,50 +126,24 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--search-limit", type=int, default=10)
     parser.add_argument("--timeout-seconds", type=float, default=5.0)
     parser.add_argument("--seed", type=int, default=42)
-    parser.add_argument(
-        "--strict-max-error-rate",
-        type=float,
-        default=float(os.environ.get("AIONBD_MVP_LOAD_MAX_ERROR_RATE", "0.05")),
-    )
-    parser.add_argument(
-        "--strict-max-latency-us-p95",
-        type=int,
-        default=int(os.environ.get("AIONBD_MVP_LOAD_MAX_LATENCY_US_P95", "300000")),
-    )
-    parser.add_argument(
-        "--strict-max-latency-us-p99",
-        type=int,
-        default=int(os.environ.get("AIONBD_MVP_LOAD_MAX_LATENCY_US_P99", "600000")),
-    )
-    parser.add_argument(
-        "--strict-min-throughput-ops-per-second",
-        type=float,
-        default=float(
-            os.environ.get("AIONBD_MVP_LOAD_MIN_THROUGHPUT_OPS_PER_SECOND", "20")
-        ),
-    )
-    parser.add_argument(
-        "--report-path",
-        default=os.environ.get(
-            "AIONBD_MVP_LOAD_REPORT_PATH", "bench/reports/mvp_load_profile_report.md"
-        ),
-    )
-    parser.add_argument(
-        "--report-json-path",
-        default=os.environ.get(
-            "AIONBD_MVP_LOAD_REPORT_JSON_PATH",
-            "bench/reports/mvp_load_profile_report.json",
-        ),
-    )
-    parser.add_argument(
-        "--raw-report-path",
-        default=os.environ.get(
-            "AIONBD_MVP_LOAD_RAW_REPORT_PATH", "bench/reports/mvp_load_profile_raw.json"
-        ),
-    )
+    parser.add_argument("--strict-max-error-rate", type=float)
+    parser.add_argument("--strict-max-latency-us-p95", type=int)
+    parser.add_argument("--strict-max-latency-us-p99", type=int)
+    parser.add_argument("--strict-min-throughput-ops-per-second", type=float)
+    parser.add_argument("--report-path")
+    parser.add_argument("--report-json-path")
+    parser.add_argument("--raw-report-path")
     parser.add_argument("--recreate-collection", action="store_true")
     parser.add_argument("--dry-run", action="store_true")
-    return parser.parse_args()
+    return parser
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    args = _build_parser().parse_args(argv)
+    for dest, env_name, fallback, convert in ENV_DEFAULTS:
+        if getattr(args, dest) is None:
+            setattr(args, dest, convert(os.environ.get(env_name, fallback)))
+    return args
 
 
 def validate_args(args: argparse.Namespace) -> None:
@@ -145,7 +174,7 @@ def validate_args(args: argparse.Namespace) -> None:
 
 
 def run_soak_profile(args: argparse.Namespace, raw_report_path: Path) -> dict[str, Any]:
-    raw_report_path = ensure_trusted_io_path(raw_report_path, label="raw-report-path")
+    """Run the soak harness; `raw_report_path` must already be trusted."""
     raw_report_path.parent.mkdir(parents=True, exist_ok=True)
     if raw_report_path.exists():
         raw_report_path.unlink()
@@ -197,30 +226,36 @@ def run_soak_profile(args: argparse.Namespace, raw_report_path: Path) -> dict[st
         str(args.seed),
         "--strict-max-error-rate",
         str(SOAK_STRICT_MAX_ERROR_RATE),
-        "--report-json",
-        str(raw_report_path),
     ]
     if args.recreate_collection:
         command.append("--recreate-collection")
 
-    completed = subprocess.run(
-        command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=False
-    )
-    if completed.stdout:
-        print(completed.stdout, end="")
-    if completed.stderr:
-        print(completed.stderr, end="", file=sys.stderr)
-    if completed.returncode != 0:
+    # The soak harness prints its report as a compact JSON line last, so
+    # stream its stdout through and keep that line instead of round-tripping
+    # the report through a file. stderr is inherited directly.
+    sys.stdout.flush()
+    sys.stderr.flush()
+    summary_line = b""
+    with subprocess.Popen(command, stdout=subprocess.PIPE) as process:
+        assert process.stdout is not None
+        for line in process.stdout:
+            sys.stdout.buffer.write(line)
+            if line.strip():
+                summary_line = line
+    sys.stdout.buffer.flush()
+    if process.returncode != 0:
         raise RuntimeError("mvp load soak run failed")
 
-    payload = json.loads(
-        ensure_trusted_io_path(
-            raw_report_path, label="raw-report-path", must_exist=True
-        ).read_text(encoding="utf-8")
-    )
+    try:
+        payload = loads_json(summary_line)
+    except ValueError as error:
+        raise RuntimeError("soak run did not print a JSON report line") from error
+    if not isinstance(payload, dict):
+        raise RuntimeError("soak run report line must be a JSON object")
     for field in REQUIRED_FIELDS:
         if field not in payload:
             raise RuntimeError(f"missing required field in soak report: {field}")
+    write_bytes_atomic(raw_report_path, dumps_json(payload) + b"\n")
     return payload
 
 
@@ -275,12 +310,16 @@ def markdown_report(
         "",
         "## Results",
         "",
-        "| total_ops | read_ops | write_ops | error_rate | throughput_ops_s | p50_us | p95_us | p99_us |",
-        "|---:|---:|---:|---:|---:|---:|---:|---:|",
-        (
-            f"| {int(payload['total_ops'])} | {int(payload['read_ops'])} | {int(payload['write_ops'])} | "
-            f"{float(payload['error_rate']):.6f} | {float(payload['throughput_ops_per_second']):.3f} | "
-            f"{int(payload['latency_us_p50'])} | {int(payload['latency_us_p95'])} | {int(payload['latency_us_p99'])} |"
+        RESULTS_TABLE_HEADER,
+        RESULTS_ROW_FMT.format(
+            total_ops=int(payload["total_ops"]),
+            read_ops=int(payload["read_ops"]),
+            write_ops=int(payload["write_ops"]),
+            error_rate=float(payload["error_rate"]),
+            throughput=float(payload["throughput_ops_per_second"]),
+            p50=int(payload["latency_us_p50"]),
+            p95=int(payload["latency_us_p95"]),
+            p99=int(payload["latency_us_p99"]),
         ),
         "",
         "## Thresholds",
@@ -293,8 +332,7 @@ def markdown_report(
 
     if failures:
         lines.extend(["", "## Failures", ""])
-        for failure in failures:
-            lines.append(f"- {failure}")
+        lines.extend(f"- {failure}" for failure in failures)
 
     return "\n".join(lines) + "\n"
 
@@ -318,10 +356,7 @@ def main() -> int:
 
     payload = run_soak_profile(args, raw_report_path)
     failures = evaluate(args, payload)
-    generated_at = datetime.now(timezone.utc).isoformat()
-
-    report_md_path.parent.mkdir(parents=True, exist_ok=True)
-    report_json_path.parent.mkdir(parents=True, exist_ok=True)
+    generated_at = utc_now_iso()
 
     report_payload = {
         "generated_at_utc": generated_at,
@@ -349,13 +384,19 @@ def main() -> int:
         "failures": failures,
     }
 
-    ensure_trusted_io_path(report_md_path, label="report-path").write_text(
-        markdown_report(generated_at, args, payload, failures),
-        encoding="utf-8",
-    )
-    ensure_trusted_io_path(report_json_path, label="report-json-path").write_text(
-        json.dumps(report_payload, indent=2) + "\n", encoding="utf-8"
-    )
+    # Paths were resolved and validated once above; no re-resolve at the sinks.
+    markdown = markdown_report(generated_at, args, payload, failures)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        pending = (
+            executor.submit(
+                write_bytes_atomic, report_md_path, markdown.encode("utf-8")
+            ),
+            executor.submit(
+                write_bytes_atomic, report_json_path, dumps_json(report_payload) + b"\n"
+            ),
+        )
+        for future in pending:
+            future.result()
 
     print(f"report_markdown={report_md_path}")
     print(f"report_json={report_json_path}")
@@ -3,15 +3,20 @@
 
 from __future__ import annotations
 
-import json
 import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from pathlib import Path
 
+try:
+    from report_io import dumps_json, utc_now_iso, write_bytes_atomic
+except ModuleNotFoundError:
+    from scripts.report_io import dumps_json, utc_now_iso, write_bytes_atomic
+
 ROW_PREFIX = "bench=persistence_write_row "
+ROW_PREFIX_BYTES = ROW_PREFIX.encode("ascii")
 BASELINE_STRATEGY = "single_sync_each_write"
 STRATEGY_ORDER = {
     BASELINE_STRATEGY: 0,
@@ -19,9 +24,13 @@ STRATEGY_ORDER = {
     "group_sync_each_batch": 2,
     "group_sync_every_n": 3,
 }
+REPORT_ROW_FMT = (
+    "| {strategy} | {p50_ms:.6f} | {p95_ms:.6f} | {p99_ms:.6f} | {avg_ms:.6f} | "
+    "{qps:.2f} | {wal_mb:.3f} | {qps_ratio:.3f}x | {p95_ratio:.3f}x | {wal_ratio:.3f}x |"
+)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BenchRow:
     strategy: str
     p50_ms: float
@@ -64,30 +73,24 @@ def parse_row(line: str) -> BenchRow | None:
 
 
 def run_persistence_write_bench() -> list[BenchRow]:
-    env = os.environ.copy()
-    env["AIONBD_BENCH_SCENARIO"] = "persistence_write"
+    env = os.environ | {"AIONBD_BENCH_SCENARIO": "persistence_write"}
     command = ["cargo", "run", "--release", "-p", "aionbd-bench"]
-    completed = subprocess.run(
-        command,
-        env=env,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        check=False,
-    )
-
-    if completed.stdout:
-        print(completed.stdout, end="")
-    if completed.stderr:
-        print(completed.stderr, end="", file=sys.stderr)
-    if completed.returncode != 0:
-        raise RuntimeError("persistence write benchmark command failed")
-
     rows: list[BenchRow] = []
-    for line in completed.stdout.splitlines():
-        parsed = parse_row(line)
-        if parsed is not None:
-            rows.append(parsed)
+    sys.stdout.flush()
+    # Stream stdout as bytes and only decode benchmark rows; build logs and
+    # other output are echoed through untouched. stderr is inherited.
+    with subprocess.Popen(command, env=env, stdout=subprocess.PIPE) as process:
+        assert process.stdout is not None
+        for line in process.stdout:
+            sys.stdout.buffer.write(line)
+            if not line.startswith(ROW_PREFIX_BYTES):
+                continue
+            parsed = parse_row(line.decode("utf-8"))
+            if parsed is not None:
+                rows.append(parsed)
+    sys.stdout.buffer.flush()
+    if process.returncode != 0:
+        raise RuntimeError("persistence write benchmark command failed")
 
     if not rows:
         raise RuntimeError(
@@ -103,11 +106,10 @@ def ratio_or_zero(numerator: float, denominator: float) -> float:
     return numerator / denominator
 
 
-def benchmark_report(rows: list[BenchRow], generated_at: str) -> str:
-    sorted_rows = sorted(rows, key=lambda row: STRATEGY_ORDER.get(row.strategy, 99))
-    baseline = next(
-        (row for row in sorted_rows if row.strategy == BASELINE_STRATEGY), None
-    )
+def benchmark_report(
+    ordered_rows: list[BenchRow], by_strategy: dict[str, BenchRow], generated_at: str
+) -> str:
+    baseline = by_strategy.get(BASELINE_STRATEGY)
     if baseline is None:
         raise RuntimeError(f"missing baseline strategy row: {BASELINE_STRATEGY}")
 
@@ -119,20 +121,25 @@ def benchmark_report(rows: list[BenchRow], generated_at: str) -> str:
         "| strategy | p50_ms | p95_ms | p99_ms | avg_ms | qps | wal_mb | qps_vs_baseline | p95_vs_baseline | wal_vs_baseline |",
         "|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|",
     ]
-    for row in sorted_rows:
-        lines.append(
-            "| "
-            f"{row.strategy} | {row.p50_ms:.6f} | {row.p95_ms:.6f} | {row.p99_ms:.6f} | "
-            f"{row.avg_ms:.6f} | {row.qps:.2f} | {row.wal_mb:.3f} | "
-            f"{ratio_or_zero(row.qps, baseline.qps):.3f}x | "
-            f"{ratio_or_zero(row.p95_ms, baseline.p95_ms):.3f}x | "
-            f"{ratio_or_zero(row.wal_mb, baseline.wal_mb):.3f}x |"
+    lines.extend(
+        REPORT_ROW_FMT.format(
+            strategy=row.strategy,
+            p50_ms=row.p50_ms,
+            p95_ms=row.p95_ms,
+            p99_ms=row.p99_ms,
+            avg_ms=row.avg_ms,
+            qps=row.qps,
+            wal_mb=row.wal_mb,
+            qps_ratio=ratio_or_zero(row.qps, baseline.qps),
+            p95_ratio=ratio_or_zero(row.p95_ms, baseline.p95_ms),
+            wal_ratio=ratio_or_zero(row.wal_mb, baseline.wal_mb),
         )
+        for row in ordered_rows
+    )
     return "\n".join(lines) + "\n"
 
 
-def validate_thresholds(rows: list[BenchRow]) -> list[str]:
-    by_strategy = {row.strategy: row for row in rows}
+def validate_thresholds(by_strategy: dict[str, BenchRow]) -> list[str]:
     baseline = by_strategy.get(BASELINE_STRATEGY)
     if baseline is None:
         return [f"strategy={BASELINE_STRATEGY} missing_baseline"]
@@ -175,7 +182,9 @@ def validate_thresholds(rows: list[BenchRow]) -> list[str]:
     return failures
 
 
-def json_report_payload(rows: list[BenchRow], generated_at: str) -> dict[str, object]:
+def json_report_payload(
+    ordered_rows: list[BenchRow], generated_at: str
+) -> dict[str, object]:
     return {
         "generated_at_utc": generated_at,
         "rows": [
@@ -189,32 +198,29 @@ def json_report_payload(rows: list[BenchRow], generated_at: str) -> dict[str, ob
                 "wal_bytes": row.wal_bytes,
                 "wal_mb": row.wal_mb,
             }
-            for row in sorted(
-                rows, key=lambda row: STRATEGY_ORDER.get(row.strategy, 99)
-            )
+            for row in ordered_rows
         ],
     }
 
 
 def write_text(path: Path, text: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(text, encoding="utf-8")
+    write_bytes_atomic(path, text.encode("utf-8"))
 
 
 def write_json(path: Path, payload: dict[str, object]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, indent=2, sort_keys=False), encoding="utf-8")
+    write_bytes_atomic(path, dumps_json(payload))
 
 
 def main() -> int:
-    generated_at = datetime.now(timezone.utc).isoformat()
+    generated_at = utc_now_iso()
     try:
         rows = run_persistence_write_bench()
     except Exception as exc:  # pylint: disable=broad-except
         print(f"error=bench_pipeline_failed message={exc}", file=sys.stderr)
         return 1
 
-    failures = validate_thresholds(rows)
+    by_strategy = {row.strategy: row for row in rows}
+    failures = validate_thresholds(by_strategy)
     if failures:
         for failure in failures:
             print(f"error=benchmark_threshold_failed {failure}", file=sys.stderr)
@@ -233,10 +239,16 @@ def main() -> int:
         )
     )
 
-    markdown = benchmark_report(rows, generated_at)
-    payload = json_report_payload(rows, generated_at)
-    write_text(markdown_path, markdown)
-    write_json(json_path, payload)
+    ordered_rows = sorted(rows, key=lambda row: STRATEGY_ORDER.get(row.strategy, 99))
+    markdown = benchmark_report(ordered_rows, by_strategy, generated_at)
+    payload = json_report_payload(ordered_rows, generated_at)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        pending = (
+            executor.submit(write_text, markdown_path, markdown),
+            executor.submit(write_json, json_path, payload),
+        )
+        for future in pending:
+            future.result()
 
     print(f"report_markdown={markdown_path}")
     print(f"report_json={json_path}")
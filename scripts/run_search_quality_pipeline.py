@@ -3,19 +3,35 @@
 
 from __future__ import annotations
 
-import json
 import os
-import subprocess
+import re
 import sys
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from pathlib import Path
 
+try:
+    from bench_cache import iter_bench_stdout
+    from report_io import dumps_json, utc_now_iso, write_bytes_atomic
+except ModuleNotFoundError:
+    from scripts.bench_cache import iter_bench_stdout
+    from scripts.report_io import dumps_json, utc_now_iso, write_bytes_atomic
+
 ROW_PREFIX = "bench=search_quality_row "
+# Field order is fixed by the bench binary (bench/src/search_quality_bench.rs).
+ROW_RE = re.compile(
+    r"^bench=search_quality_row dataset=(?P<dataset>\S+) mode=(?P<mode>\S+) "
+    r"recall_at_k=(?P<recall_at_k>\S+) p50_ms=(?P<p50_ms>\S+) "
+    r"p95_ms=(?P<p95_ms>\S+) p99_ms=(?P<p99_ms>\S+) "
+    r"memory_bytes=(?P<memory_bytes>\S+)\s*$"
+)
 MODE_ORDER = {"exact": 0, "ivf": 1, "auto": 2}
+REPORT_ROW_TMPL = (
+    "| {dataset} | {mode} | {recall_at_k:.4f} | {p50_ms:.6f} | {p95_ms:.6f} | "
+    "{p99_ms:.6f} | {memory_mb:.3f} | {p95_ratio:.3f}x | {mem_ratio:.3f}x |"
+)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BenchRow:
     dataset: str
     mode: str
@@ -24,72 +40,37 @@ class BenchRow:
     p95_ms: float
     p99_ms: float
     memory_bytes: int
-
-    @property
-    def memory_mb(self) -> float:
-        return self.memory_bytes / (1024.0 * 1024.0)
+    memory_mb: float
 
 
 def parse_row(line: str) -> BenchRow | None:
-    if not line.startswith(ROW_PREFIX):
+    match = ROW_RE.match(line)
+    if match is None:
+        if line.startswith(ROW_PREFIX):
+            raise ValueError(f"malformed benchmark row: {line.strip()}")
         return None
 
-    fields: dict[str, str] = {}
-    for token in line.strip().split()[1:]:
-        if "=" not in token:
-            continue
-        key, value = token.split("=", 1)
-        fields[key] = value
-
-    required = (
-        "dataset",
-        "mode",
-        "recall_at_k",
-        "p50_ms",
-        "p95_ms",
-        "p99_ms",
-        "memory_bytes",
-    )
-    missing = [field for field in required if field not in fields]
-    if missing:
-        raise ValueError(f"missing benchmark fields {missing} in line: {line.strip()}")
-
+    dataset, mode, recall_at_k, p50_ms, p95_ms, p99_ms, memory_bytes = match.groups()
+    mem = int(memory_bytes)
     return BenchRow(
-        dataset=fields["dataset"],
-        mode=fields["mode"],
-        recall_at_k=float(fields["recall_at_k"]),
-        p50_ms=float(fields["p50_ms"]),
-        p95_ms=float(fields["p95_ms"]),
-        p99_ms=float(fields["p99_ms"]),
-        memory_bytes=int(fields["memory_bytes"]),
+        dataset=dataset,
+        mode=mode,
+        recall_at_k=float(recall_at_k),
+        p50_ms=float(p50_ms),
+        p95_ms=float(p95_ms),
+        p99_ms=float(p99_ms),
+        memory_bytes=mem,
+        memory_mb=mem / (1024.0 * 1024.0),
     )
 
 
 def run_search_quality_bench() -> list[BenchRow]:
-    env = os.environ.copy()
-    env["AIONBD_BENCH_SCENARIO"] = "search_quality"
+    env = os.environ | {"AIONBD_BENCH_SCENARIO": "search_quality"}
     command = ["cargo", "run", "--release", "-p", "aionbd-bench"]
-    completed = subprocess.run(
-        command,
-        env=env,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        check=False,
+    lines = iter_bench_stdout(
+        command, env, label="search quality benchmark", row_prefix=ROW_PREFIX
     )
-
-    if completed.stdout:
-        print(completed.stdout, end="")
-    if completed.stderr:
-        print(completed.stderr, end="", file=sys.stderr)
-    if completed.returncode != 0:
-        raise RuntimeError("search quality benchmark command failed")
-
-    rows: list[BenchRow] = []
-    for line in completed.stdout.splitlines():
-        parsed = parse_row(line)
-        if parsed is not None:
-            rows.append(parsed)
+    rows = [row for row in map(parse_row, lines) if row is not None]
 
     if not rows:
         raise RuntimeError(
@@ -99,14 +80,42 @@ def run_search_quality_bench() -> list[BenchRow]:
     return rows
 
 
-def ratio_or_zero(numerator: float, denominator: float) -> float:
+def inverse_or_zero(denominator: float) -> float:
+    """Reciprocal of a baseline metric; ratios against a zero baseline read as 0."""
     if denominator <= 0.0:
         return 0.0
-    return numerator / denominator
+    return 1.0 / denominator
+
 
+@dataclass(frozen=True, slots=True)
+class RowIndex:
+    """Rows grouped once per run and shared by the validators and reports."""
 
-def benchmark_report(rows: list[BenchRow], generated_at: str) -> str:
-    datasets = sorted({row.dataset for row in rows})
+    by_dataset: dict[str, list[BenchRow]]
+    exact_by_dataset: dict[str, BenchRow]
+    sorted_rows: list[BenchRow]
+
+
+def index_rows(rows: list[BenchRow]) -> RowIndex:
+    """Group rows per dataset (sorted, mode-ordered) and index exact baselines."""
+    grouped: dict[str, list[BenchRow]] = {}
+    exact_by_dataset: dict[str, BenchRow] = {}
+    for row in rows:
+        grouped.setdefault(row.dataset, []).append(row)
+        if row.mode == "exact":
+            exact_by_dataset[row.dataset] = row
+    by_dataset: dict[str, list[BenchRow]] = {}
+    sorted_rows: list[BenchRow] = []
+    for dataset in sorted(grouped):
+        dataset_rows = sorted(
+            grouped[dataset], key=lambda row: MODE_ORDER.get(row.mode, 99)
+        )
+        by_dataset[dataset] = dataset_rows
+        sorted_rows.extend(dataset_rows)
+    return RowIndex(by_dataset, exact_by_dataset, sorted_rows)
+
+
+def benchmark_report(index: RowIndex, generated_at: str) -> str:
     lines = [
         "# Search Quality Benchmark Report",
         "",
@@ -116,106 +125,97 @@ def benchmark_report(rows: list[BenchRow], generated_at: str) -> str:
         "|---|---:|---:|---:|---:|---:|---:|---:|---:|",
     ]
 
-    for dataset in datasets:
-        dataset_rows = sorted(
-            [row for row in rows if row.dataset == dataset],
-            key=lambda row: MODE_ORDER.get(row.mode, 99),
-        )
-        exact = next((row for row in dataset_rows if row.mode == "exact"), None)
+    for dataset, dataset_rows in index.by_dataset.items():
+        exact = index.exact_by_dataset.get(dataset)
         if exact is None:
             raise RuntimeError(f"dataset '{dataset}' is missing exact mode row")
-        for row in dataset_rows:
-            lines.append(
-                "| "
-                f"{row.dataset} | {row.mode} | {row.recall_at_k:.4f} | "
-                f"{row.p50_ms:.6f} | {row.p95_ms:.6f} | {row.p99_ms:.6f} | "
-                f"{row.memory_mb:.3f} | "
-                f"{ratio_or_zero(row.p95_ms, exact.p95_ms):.3f}x | "
-                f"{ratio_or_zero(row.memory_mb, exact.memory_mb):.3f}x |"
+        inv_p95 = inverse_or_zero(exact.p95_ms)
+        inv_mem = inverse_or_zero(exact.memory_mb)
+        lines.extend(
+            REPORT_ROW_TMPL.format_map(
+                {
+                    "dataset": row.dataset,
+                    "mode": row.mode,
+                    "recall_at_k": row.recall_at_k,
+                    "p50_ms": row.p50_ms,
+                    "p95_ms": row.p95_ms,
+                    "p99_ms": row.p99_ms,
+                    "memory_mb": row.memory_mb,
+                    "p95_ratio": row.p95_ms * inv_p95,
+                    "mem_ratio": row.memory_mb * inv_mem,
+                }
             )
+            for row in dataset_rows
+        )
 
     return "\n".join(lines) + "\n"
 
 
-def validate_recall_thresholds(rows: list[BenchRow]) -> list[str]:
-    min_ivf = float(os.environ.get("AIONBD_BENCH_MIN_RECALL_IVF", "0.0"))
-    min_auto = float(os.environ.get("AIONBD_BENCH_MIN_RECALL_AUTO", "0.0"))
+def validate_recall_thresholds(index: RowIndex) -> list[str]:
+    min_recall = {
+        "ivf": float(os.environ.get("AIONBD_BENCH_MIN_RECALL_IVF", "0.0")),
+        "auto": float(os.environ.get("AIONBD_BENCH_MIN_RECALL_AUTO", "0.0")),
+    }
 
     failures: list[str] = []
-    for row in rows:
-        if row.mode == "ivf" and row.recall_at_k < min_ivf:
-            failures.append(
-                f"dataset={row.dataset} mode=ivf recall_at_k={row.recall_at_k:.6f} "
-                f"< min={min_ivf:.6f}"
-            )
-        if row.mode == "auto" and row.recall_at_k < min_auto:
+    for row in index.sorted_rows:
+        min_value = min_recall.get(row.mode)
+        if min_value is not None and row.recall_at_k < min_value:
             failures.append(
-                f"dataset={row.dataset} mode=auto recall_at_k={row.recall_at_k:.6f} "
-                f"< min={min_auto:.6f}"
+                f"dataset={row.dataset} mode={row.mode} "
+                f"recall_at_k={row.recall_at_k:.6f} < min={min_value:.6f}"
             )
     return failures
 
 
-def validate_perf_memory_thresholds(rows: list[BenchRow]) -> list[str]:
-    max_p95_ratio_ivf = float(os.environ.get("AIONBD_BENCH_MAX_P95_RATIO_IVF", "inf"))
-    max_p95_ratio_auto = float(os.environ.get("AIONBD_BENCH_MAX_P95_RATIO_AUTO", "inf"))
-    max_mem_ratio_ivf = float(
-        os.environ.get("AIONBD_BENCH_MAX_MEMORY_RATIO_IVF", "inf")
-    )
-    max_mem_ratio_auto = float(
-        os.environ.get("AIONBD_BENCH_MAX_MEMORY_RATIO_AUTO", "inf")
-    )
+def ratio_failure(dataset: str, mode: str, metric: str, ratio: float, limit: float) -> str:
+    return f"dataset={dataset} mode={mode} {metric}={ratio:.6f} > max={limit:.6f}"
+
+
+def validate_perf_memory_thresholds(index: RowIndex) -> list[str]:
+    # mode -> (max p95 ratio, max memory ratio), parsed once per call.
+    limits = {
+        "ivf": (
+            float(os.environ.get("AIONBD_BENCH_MAX_P95_RATIO_IVF", "inf")),
+            float(os.environ.get("AIONBD_BENCH_MAX_MEMORY_RATIO_IVF", "inf")),
+        ),
+        "auto": (
+            float(os.environ.get("AIONBD_BENCH_MAX_P95_RATIO_AUTO", "inf")),
+            float(os.environ.get("AIONBD_BENCH_MAX_MEMORY_RATIO_AUTO", "inf")),
+        ),
+    }
 
     failures: list[str] = []
-    datasets = sorted({row.dataset for row in rows})
-    for dataset in datasets:
-        dataset_rows = [row for row in rows if row.dataset == dataset]
-        exact = next((row for row in dataset_rows if row.mode == "exact"), None)
+    for dataset, dataset_rows in index.by_dataset.items():
+        exact = index.exact_by_dataset.get(dataset)
         if exact is None:
             failures.append(f"dataset={dataset} mode=exact missing_exact_baseline")
             continue
 
+        inv_p95 = inverse_or_zero(exact.p95_ms)
+        inv_mem = inverse_or_zero(exact.memory_mb)
         for row in dataset_rows:
-            p95_ratio = ratio_or_zero(row.p95_ms, exact.p95_ms)
-            mem_ratio = ratio_or_zero(row.memory_mb, exact.memory_mb)
-            if row.mode == "ivf":
-                if p95_ratio > max_p95_ratio_ivf:
-                    failures.append(
-                        "dataset={dataset} mode=ivf p95_ratio={ratio:.6f} > max={max_ratio:.6f}".format(
-                            dataset=dataset,
-                            ratio=p95_ratio,
-                            max_ratio=max_p95_ratio_ivf,
-                        )
-                    )
-                if mem_ratio > max_mem_ratio_ivf:
-                    failures.append(
-                        "dataset={dataset} mode=ivf memory_ratio={ratio:.6f} > max={max_ratio:.6f}".format(
-                            dataset=dataset,
-                            ratio=mem_ratio,
-                            max_ratio=max_mem_ratio_ivf,
-                        )
-                    )
-            if row.mode == "auto":
-                if p95_ratio > max_p95_ratio_auto:
-                    failures.append(
-                        "dataset={dataset} mode=auto p95_ratio={ratio:.6f} > max={max_ratio:.6f}".format(
-                            dataset=dataset,
-                            ratio=p95_ratio,
-                            max_ratio=max_p95_ratio_auto,
-                        )
-                    )
-                if mem_ratio > max_mem_ratio_auto:
-                    failures.append(
-                        "dataset={dataset} mode=auto memory_ratio={ratio:.6f} > max={max_ratio:.6f}".format(
-                            dataset=dataset,
-                            ratio=mem_ratio,
-                            max_ratio=max_mem_ratio_auto,
-                        )
+            mode_limits = limits.get(row.mode)
+            if mode_limits is None:
+                continue
+            max_p95_ratio, max_mem_ratio = mode_limits
+            p95_ratio = row.p95_ms * inv_p95
+            mem_ratio = row.memory_mb * inv_mem
+            # Messages are only formatted on the failing path.
+            if p95_ratio > max_p95_ratio:
+                failures.append(
+                    ratio_failure(dataset, row.mode, "p95_ratio", p95_ratio, max_p95_ratio)
+                )
+            if mem_ratio > max_mem_ratio:
+                failures.append(
+                    ratio_failure(
+                        dataset, row.mode, "memory_ratio", mem_ratio, max_mem_ratio
                     )
+                )
     return failures
 
 
-def json_report_payload(rows: list[BenchRow], generated_at: str) -> dict[str, object]:
+def json_report_payload(index: RowIndex, generated_at: str) -> dict[str, object]:
     return {
         "generated_at_utc": generated_at,
         "rows": [
@@ -229,33 +229,30 @@ def json_report_payload(rows: list[BenchRow], generated_at: str) -> dict[str, ob
                 "memory_bytes": row.memory_bytes,
                 "memory_mb": row.memory_mb,
             }
-            for row in sorted(
-                rows, key=lambda row: (row.dataset, MODE_ORDER.get(row.mode, 99))
-            )
+            for row in index.sorted_rows
         ],
     }
 
 
 def write_text(path: Path, text: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(text, encoding="utf-8")
+    write_bytes_atomic(path, text.encode("utf-8"))
 
 
 def write_json(path: Path, payload: dict[str, object]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, indent=2, sort_keys=False), encoding="utf-8")
+    write_bytes_atomic(path, dumps_json(payload))
 
 
 def main() -> int:
-    generated_at = datetime.now(timezone.utc).isoformat()
+    generated_at = utc_now_iso(with_micros=False)
     try:
         rows = run_search_quality_bench()
     except Exception as exc:  # pylint: disable=broad-except
         print(f"error=bench_pipeline_failed message={exc}", file=sys.stderr)
         return 1
 
-    failures = validate_recall_thresholds(rows)
-    failures.extend(validate_perf_memory_thresholds(rows))
+    index = index_rows(rows)
+    failures = validate_recall_thresholds(index)
+    failures.extend(validate_perf_memory_thresholds(index))
     if failures:
         for failure in failures:
             print(f"error=benchmark_threshold_failed {failure}", file=sys.stderr)
@@ -274,8 +271,8 @@ def main() -> int:
         )
     )
 
-    markdown = benchmark_report(rows, generated_at)
-    payload = json_report_payload(rows, generated_at)
+    markdown = benchmark_report(index, generated_at)
+    payload = json_report_payload(index, generated_at)
     write_text(markdown_path, markdown)
     write_json(json_path, payload)
 
@@ -4,99 +4,38 @@
 from __future__ import annotations
 
 import argparse
-import json
+import asyncio
 import os
-import subprocess
 import sys
-from datetime import datetime, timezone
 from pathlib import Path
+from typing import TextIO
 
 try:
     from path_guard import resolve_io_path, safe_name_component
+    from report_io import dumps_json, loads_json, utc_now_iso, write_bytes_atomic
+    from soak_profiles import load_profiles
 except ModuleNotFoundError:
     from scripts.path_guard import resolve_io_path, safe_name_component
+    from scripts.report_io import dumps_json, loads_json, utc_now_iso, write_bytes_atomic
+    from scripts.soak_profiles import load_profiles
 
 SOAK_SCRIPT = Path(__file__).resolve().parent / "run_soak_test.py"
-REQUIRED_REPORT_FIELDS = (
-    "duration_seconds",
-    "workers",
-    "write_ratio",
-    "throughput_ops_per_second",
-    "error_rate",
-    "latency_us_p50",
-    "latency_us_p95",
-    "latency_us_p99",
-)
-
-
-def parse_inf_env(key: str) -> float:
-    raw = os.environ.get(key)
-    return float("inf") if raw is None or raw.strip() == "" else float(raw)
-
-
-def default_profiles() -> list[dict[str, object]]:
-    base = {
-        "duration_seconds": 600,
-        "workers": 8,
-        "write_ratio": 0.2,
-        "metric": "l2",
-        "search_mode": "auto",
-        "search_limit": 10,
-        "point_space": 100_000,
-        "dimension": 256,
-        "timeout_seconds": 5.0,
-        "strict_max_error_rate": float(
-            os.environ.get("AIONBD_SOAK_MAX_ERROR_RATE", "0.05")
-        ),
-        "min_throughput_ops_per_second": float(
-            os.environ.get("AIONBD_SOAK_MIN_THROUGHPUT_OPS_PER_SECOND", "0")
-        ),
-        "max_latency_us_p95": parse_inf_env("AIONBD_SOAK_MAX_LATENCY_US_P95"),
-        "max_latency_us_p99": parse_inf_env("AIONBD_SOAK_MAX_LATENCY_US_P99"),
+REQUIRED_REPORT_FIELDS = frozenset(
+    {
+        "duration_seconds",
+        "workers",
+        "write_ratio",
+        "throughput_ops_per_second",
+        "error_rate",
+        "latency_us_p50",
+        "latency_us_p95",
+        "latency_us_p99",
     }
-    return [
-        {**base, "name": "read_heavy", "write_ratio": 0.10},
-        {**base, "name": "mixed", "write_ratio": 0.30},
-    ]
-
-
-def validate_profile(profile: dict[str, object]) -> None:
-    name = str(profile.get("name", ""))
-    if not name:
-        raise ValueError("profile name must not be empty")
-    checks = [
-        (int(profile["duration_seconds"]) > 0, "duration_seconds must be > 0"),
-        (int(profile["workers"]) > 0, "workers must be > 0"),
-        (
-            0.0 <= float(profile["write_ratio"]) <= 1.0,
-            "write_ratio must be in [0.0, 1.0]",
-        ),
-        (int(profile["search_limit"]) > 0, "search_limit must be > 0"),
-        (int(profile["point_space"]) > 0, "point_space must be > 0"),
-        (int(profile["dimension"]) > 0, "dimension must be > 0"),
-        (float(profile["timeout_seconds"]) > 0, "timeout_seconds must be > 0"),
-    ]
-    for ok, message in checks:
-        if not ok:
-            raise ValueError(f"profile={name} {message}")
-
-
-def load_profiles() -> list[dict[str, object]]:
-    defaults = default_profiles()
-    raw_json = os.environ.get("AIONBD_SOAK_PROFILES_JSON", "").strip()
-    if not raw_json:
-        profiles = defaults
-    else:
-        parsed = json.loads(raw_json)
-        if not isinstance(parsed, list):
-            raise ValueError("AIONBD_SOAK_PROFILES_JSON must be a JSON list")
-        base = defaults[0]
-        profiles = [{**base, **item} for item in parsed if isinstance(item, dict)]
-    if not profiles:
-        raise ValueError("no soak profiles configured")
-    for profile in profiles:
-        validate_profile(profile)
-    return profiles
+)
+REPORT_ROW_TMPL = (
+    "| {profile} | {duration:.3f} | {workers} | {write_ratio:.3f} | {throughput:.3f} "
+    "| {error_rate:.6f} | {p50} | {p95} | {p99} |"
+)
 
 
 def dry_run_result(profile: dict[str, object]) -> dict[str, object]:
@@ -124,7 +63,13 @@ def dry_run_result(profile: dict[str, object]) -> dict[str, object]:
     }
 
 
-def run_profile(
+async def drain_stream(stream: asyncio.StreamReader, sink: TextIO) -> None:
+    while line := await stream.readline():
+        sink.write(line.decode("utf-8", errors="replace"))
+        sink.flush()
+
+
+async def run_profile(
     profile: dict[str, object],
     base_url: str,
     collection_prefix: str,
@@ -135,7 +80,7 @@ def run_profile(
     if dry_run:
         return dry_run_result(profile)
     reports_dir.mkdir(parents=True, exist_ok=True)
-    profile_name = safe_name_component(str(profile["name"]), label="profile name")
+    profile_name = str(profile["_safe_name"])
     report_path = reports_dir / f"{profile_name}.json"
     command = [
         sys.executable,
@@ -169,21 +114,24 @@ def run_profile(
     ]
     if recreate_collections:
         command.append("--recreate-collection")
-    completed = subprocess.run(
-        command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=False
+    process = await asyncio.create_subprocess_exec(
+        *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    assert process.stdout is not None and process.stderr is not None
+    # Both pipes are drained concurrently so a chatty profile cannot fill one
+    # pipe buffer and stall while we wait on the other.
+    await asyncio.gather(
+        drain_stream(process.stdout, sys.stdout),
+        drain_stream(process.stderr, sys.stderr),
     )
-    if completed.stdout:
-        print(completed.stdout, end="")
-    if completed.stderr:
-        print(completed.stderr, end="", file=sys.stderr)
-    if completed.returncode != 0:
+    if await process.wait() != 0:
         raise RuntimeError(f"soak profile '{profile_name}' failed")
-    payload = json.loads(report_path.read_text(encoding="utf-8"))
-    for field in REQUIRED_REPORT_FIELDS:
-        if field not in payload:
-            raise RuntimeError(
-                f"soak profile '{profile_name}' missing report field: {field}"
-            )
+    payload = loads_json(report_path.read_bytes())
+    missing = REQUIRED_REPORT_FIELDS.difference(payload)
+    if missing:
+        raise RuntimeError(
+            f"soak profile '{profile_name}' missing report fields: {sorted(missing)}"
+        )
     return payload
 
 
@@ -220,23 +168,47 @@ def markdown_report(generated_at: str, rows: list[dict[str, object]]) -> str:
         "| profile | duration_s | workers | write_ratio | throughput_ops_s | error_rate | p50_us | p95_us | p99_us |",
         "|---|---:|---:|---:|---:|---:|---:|---:|---:|",
     ]
-    for row in rows:
-        lines.append(
-            "| {profile} | {duration:.3f} | {workers} | {write_ratio:.3f} | {throughput:.3f} | {error_rate:.6f} | {p50} | {p95} | {p99} |".format(
-                profile=row["profile"],
-                duration=float(row["duration_seconds"]),
-                workers=int(row["workers"]),
-                write_ratio=float(row["write_ratio"]),
-                throughput=float(row["throughput_ops_per_second"]),
-                error_rate=float(row["error_rate"]),
-                p50=int(row["latency_us_p50"]),
-                p95=int(row["latency_us_p95"]),
-                p99=int(row["latency_us_p99"]),
-            )
+    lines.extend(
+        REPORT_ROW_TMPL.format_map(
+            {
+                "profile": row["profile"],
+                "duration": float(row["duration_seconds"]),
+                "workers": int(row["workers"]),
+                "write_ratio": float(row["write_ratio"]),
+                "throughput": float(row["throughput_ops_per_second"]),
+                "error_rate": float(row["error_rate"]),
+                "p50": int(row["latency_us_p50"]),
+                "p95": int(row["latency_us_p95"]),
+                "p99": int(row["latency_us_p99"]),
+            }
         )
+        for row in rows
+    )
     return "\n".join(lines) + "\n"
 
 
+async def run_profiles(
+    profiles: list[dict[str, object]], args: argparse.Namespace, reports_dir: Path
+) -> list[dict[str, object]]:
+    # Each profile uses its own collection, so profiles are independent and can
+    # overlap; results are still returned in profile order. If one fails,
+    # asyncio.run cancels the rest and their subprocesses are killed.
+    semaphore = asyncio.Semaphore(args.parallel)
+
+    async def bounded(profile: dict[str, object]) -> dict[str, object]:
+        async with semaphore:
+            return await run_profile(
+                profile,
+                base_url=args.base_url,
+                collection_prefix=args.collection_prefix,
+                reports_dir=reports_dir,
+                recreate_collections=args.recreate_collections,
+                dry_run=args.dry_run,
+            )
+
+    return list(await asyncio.gather(*(bounded(profile) for profile in profiles)))
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Run AIONBD soak profiles and report results"
@@ -247,6 +219,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--profiles-file", help="path to JSON list of soak profiles")
     parser.add_argument("--recreate-collections", action="store_true")
     parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        help="max profiles to run concurrently; the server sees their combined load",
+    )
     parser.add_argument(
         "--report-path",
         default=os.environ.get(
@@ -270,6 +248,9 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> int:
     args = parse_args()
+    if args.parallel <= 0:
+        print("error=parallel must be > 0", file=sys.stderr)
+        return 2
     if args.profiles_file:
         profiles_file_path = resolve_io_path(
             args.profiles_file, label="profiles-file", must_exist=True
@@ -277,7 +258,7 @@ def main() -> int:
         os.environ["AIONBD_SOAK_PROFILES_JSON"] = profiles_file_path.read_text(
             encoding="utf-8"
         )
-    generated_at = datetime.now(timezone.utc).isoformat()
+    generated_at = utc_now_iso(with_micros=False)
     profiles = load_profiles()
     if args.profiles:
         selected = {item.strip() for item in args.profiles.split(",") if item.strip()}
@@ -285,28 +266,24 @@ def main() -> int:
         if not profiles:
             print("error=no_profiles_selected", file=sys.stderr)
             return 1
+    # Validated before any subprocess starts; run_profile reuses the result.
+    for profile in profiles:
+        profile["_safe_name"] = safe_name_component(
+            str(profile["name"]), label="profile name"
+        )
     rows: list[dict[str, object]] = []
     failures: list[str] = []
     reports_dir = resolve_io_path(args.profile_reports_dir, label="profile-reports-dir")
-    for profile in profiles:
-        row = run_profile(
-            profile,
-            base_url=args.base_url,
-            collection_prefix=args.collection_prefix,
-            reports_dir=reports_dir,
-            recreate_collections=args.recreate_collections,
-            dry_run=args.dry_run,
-        )
+    results = asyncio.run(run_profiles(profiles, args, reports_dir))
+    for profile, row in zip(profiles, results):
         row["profile"] = str(profile["name"])
         rows.append(row)
         failures.extend(evaluate(profile, row))
     report_path = resolve_io_path(args.report_path, label="report-path")
     report_json_path = resolve_io_path(args.report_json_path, label="report-json-path")
-    report_path.parent.mkdir(parents=True, exist_ok=True)
-    report_json_path.parent.mkdir(parents=True, exist_ok=True)
-    report_path.write_text(markdown_report(generated_at, rows), encoding="utf-8")
+    write_bytes_atomic(report_path, markdown_report(generated_at, rows).encode("utf-8"))
     payload = {"generated_at_utc": generated_at, "dry_run": args.dry_run, "rows": rows}
-    report_json_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    write_bytes_atomic(report_json_path, dumps_json(payload) + b"\n")
     print(f"report_markdown={report_path}")
     print(f"report_json={report_json_path}")
     if failures:
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""asyncio soak workers sharing one pooled aiohttp session (optional engine)."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+import urllib.parse
+from typing import Any
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    from soak_metrics import WorkerStats
+    from soak_workers import WRITE_BATCH_MAX_DELAY_SECONDS, vector_pool
+except ModuleNotFoundError:
+    from scripts.soak_metrics import WorkerStats
+    from scripts.soak_workers import WRITE_BATCH_MAX_DELAY_SECONDS, vector_pool
+
+
+async def flush_write_batch(
+    session: aiohttp.ClientSession,
+    points_url: str,
+    batch: list[dict[str, Any]],
+    stats: WorkerStats,
+) -> None:
+    start = time.perf_counter()
+    error = False
+    try:
+        async with session.post(points_url, json={"points": batch}) as response:
+            await response.read()
+            response.raise_for_status()
+    except Exception:  # noqa: BLE001
+        error = True
+    stats.record_batch(int((time.perf_counter() - start) * 1_000_000), len(batch), error)
+    batch.clear()
+
+
+async def worker(
+    worker_id: int,
+    args: argparse.Namespace,
+    session: aiohttp.ClientSession,
+    measure_from: float,
+    deadline: float,
+    stats: WorkerStats,
+    vectors: list[list[float]],
+) -> None:
+    # Same warm-up handling as the thread engine: staggered starts, and ops
+    # before `measure_from` are recorded into a throwaway sink.
+    await asyncio.sleep(worker_id * args.warmup_seconds / args.workers)
+    sink = WorkerStats()
+    rng = random.Random(args.seed + worker_id)
+    collection = urllib.parse.quote(args.collection.strip(), safe="")
+    base = f"{args.base_url.rstrip('/')}/collections/{collection}"
+    search_url = f"{base}/search/topk"
+    points_url = f"{base}/points"
+    vector_index = 0
+    batch: list[dict[str, Any]] = []
+    batch_started = 0.0
+    # Payload timestamps reuse the loop's perf_counter reading, shifted to the epoch.
+    epoch_offset_ms = (time.time() - time.perf_counter()) * 1000
+
+    while (now := time.perf_counter()) < deadline:
+        if sink is not stats and now >= measure_from:
+            sink = stats
+        vector = vectors[vector_index]
+        vector_index = (vector_index + 1) % len(vectors)
+        op_is_write = rng.random() < args.write_ratio
+        op = "write" if op_is_write else "read"
+        if op_is_write:
+            point_id = rng.randint(1, args.point_space)
+            payload = {
+                "worker": worker_id,
+                "sequence": rng.randint(1, 1_000_000_000),
+                "ts_ms": int(epoch_offset_ms + now * 1000),
+            }
+            if args.write_batch_size > 1:
+                if not batch:
+                    batch_started = now
+                batch.append({"id": point_id, "values": vector, "payload": payload})
+                if (
+                    len(batch) >= args.write_batch_size
+                    or now - batch_started >= WRITE_BATCH_MAX_DELAY_SECONDS
+                ):
+                    await flush_write_batch(session, points_url, batch, sink)
+                else:
+                    # Buffering does no I/O; yield so other workers get the loop.
+                    await asyncio.sleep(0)
+                continue
+        start = time.perf_counter()
+        error = False
+        try:
+            if op_is_write:
+                body = {"values": vector, "payload": payload}
+                request = session.put(f"{base}/points/{point_id}", json=body)
+            else:
+                body = {
+                    "query": vector,
+                    "metric": args.metric,
+                    "mode": args.search_mode,
+                    "limit": args.search_limit,
+                }
+                request = session.post(search_url, json=body)
+            async with request as response:
+                await response.read()
+                response.raise_for_status()
+        except Exception:  # noqa: BLE001
+            error = True
+        duration_us = int((time.perf_counter() - start) * 1_000_000)
+        sink.record(op, duration_us, error)
+
+    if batch:
+        await flush_write_batch(session, points_url, batch, sink)
+
+
+async def run_workers(
+    args: argparse.Namespace, worker_stats: list[WorkerStats], measure_from: float
+) -> None:
+    if aiohttp is None:
+        raise RuntimeError("--engine asyncio requires the aiohttp package")
+    connector = aiohttp.TCPConnector(limit=args.workers)
+    timeout = aiohttp.ClientTimeout(total=args.timeout_seconds)
+    vectors = [
+        vector_pool(args.seed + worker_id, args.dimension)
+        for worker_id in range(args.workers)
+    ]
+    deadline = measure_from + args.duration_seconds
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await asyncio.gather(
+            *(
+                worker(
+                    worker_id,
+                    args,
+                    session,
+                    measure_from,
+                    deadline,
+                    stats,
+                    vectors[worker_id],
+                )
+                for worker_id, stats in enumerate(worker_stats)
+            )
+        )
+
+
+def run_async_workers(
+    args: argparse.Namespace, worker_stats: list[WorkerStats], measure_from: float
+) -> None:
+    asyncio.run(run_workers(args, worker_stats, measure_from))
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Latency histogram and per-worker counters for the soak test harness."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+
+
+class LatencyHistogram:
+    """Fixed buckets histogram for low-overhead percentile estimation."""
+
+    BOUNDS_US = (
+        50,
+        100,
+        250,
+        500,
+        1_000,
+        2_000,
+        5_000,
+        10_000,
+        20_000,
+        50_000,
+        100_000,
+        250_000,
+        500_000,
+        1_000_000,
+        2_000_000,
+        5_000_000,
+        10_000_000,
+    )
+
+    # No per-instance __dict__: the hot `observe` path touches just these two.
+    __slots__ = ("counts", "total")
+
+    def __init__(self) -> None:
+        # Contiguous signed 64-bit slots rather than a list of boxed ints.
+        self.counts = array("q", bytes(8 * (len(self.BOUNDS_US) + 1)))
+        self.total = 0
+
+    def observe(self, latency_us: int) -> None:
+        # First bucket whose bound is >= latency_us; past the last bound lands
+        # in the overflow slot at len(BOUNDS_US).
+        self.counts[bisect_left(self.BOUNDS_US, latency_us)] += 1
+        self.total += 1
+
+    def merge(self, other: LatencyHistogram) -> None:
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.total += other.total
+
+    def percentile(self, p: float) -> int:
+        if self.total == 0:
+            return 0
+        target = max(1, int(round(self.total * p)))
+        running = 0
+        for index, count in enumerate(self.counts):
+            running += count
+            if running >= target:
+                if index < len(self.BOUNDS_US):
+                    return self.BOUNDS_US[index]
+                return self.BOUNDS_US[-1]
+        return self.BOUNDS_US[-1]
+
+
+@dataclass
+class Counters:
+    reads: int = 0
+    writes: int = 0
+    errors: int = 0
+
+
+@dataclass
+class WorkerStats:
+    """Counters and histogram owned by a single worker thread.
+
+    Each worker records into its own instance without locking; the
+    instances are only merged once workers have stopped.
+    """
+
+    counters: Counters = field(default_factory=Counters)
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def record(self, op: str, latency_us: int, error: bool) -> None:
+        self.histogram.observe(latency_us)
+        if op == "write":
+            self.counters.writes += 1
+        else:
+            self.counters.reads += 1
+        if error:
+            self.counters.errors += 1
+
+    def record_batch(self, latency_us: int, points: int, error: bool) -> None:
+        """Records one batched write request covering `points` upserts."""
+        self.histogram.observe(latency_us)
+        self.counters.writes += points
+        if error:
+            self.counters.errors += points
+
+
+def merge_worker_stats(stats: list[WorkerStats]) -> WorkerStats:
+    merged = WorkerStats()
+    for item in stats:
+        merged.histogram.merge(item.histogram)
+        merged.counters.reads += item.counters.reads
+        merged.counters.writes += item.counters.writes
+        merged.counters.errors += item.counters.errors
+    return merged
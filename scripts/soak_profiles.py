@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Soak profile defaults, loading and validation for the soak pipeline."""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import NoReturn
+
+
+def parse_inf_env(key: str) -> float:
+    raw = os.environ.get(key)
+    return float("inf") if raw is None or raw.strip() == "" else float(raw)
+
+
+def default_profiles() -> list[dict[str, object]]:
+    base = {
+        "duration_seconds": 600,
+        "workers": 8,
+        "write_ratio": 0.2,
+        "metric": "l2",
+        "search_mode": "auto",
+        "search_limit": 10,
+        "point_space": 100_000,
+        "dimension": 256,
+        "timeout_seconds": 5.0,
+        "strict_max_error_rate": float(
+            os.environ.get("AIONBD_SOAK_MAX_ERROR_RATE", "0.05")
+        ),
+        "min_throughput_ops_per_second": float(
+            os.environ.get("AIONBD_SOAK_MIN_THROUGHPUT_OPS_PER_SECOND", "0")
+        ),
+        "max_latency_us_p95": parse_inf_env("AIONBD_SOAK_MAX_LATENCY_US_P95"),
+        "max_latency_us_p99": parse_inf_env("AIONBD_SOAK_MAX_LATENCY_US_P99"),
+    }
+    return [
+        {**base, "name": "read_heavy", "write_ratio": 0.10},
+        {**base, "name": "mixed", "write_ratio": 0.30},
+    ]
+
+
+def _as_int(value: object) -> int:
+    return value if type(value) is int else int(value)
+
+
+def _as_float(value: object) -> float:
+    return value if type(value) in (int, float) else float(value)
+
+
+def validate_profile(profile: dict[str, object]) -> None:
+    name = str(profile.get("name", ""))
+    if not name:
+        raise ValueError("profile name must not be empty")
+
+    def bad(message: str) -> NoReturn:
+        raise ValueError(f"profile={name} {message}")
+
+    if _as_int(profile["duration_seconds"]) <= 0:
+        bad("duration_seconds must be > 0")
+    if _as_int(profile["workers"]) <= 0:
+        bad("workers must be > 0")
+    if not 0.0 <= _as_float(profile["write_ratio"]) <= 1.0:
+        bad("write_ratio must be in [0.0, 1.0]")
+    if _as_int(profile["search_limit"]) <= 0:
+        bad("search_limit must be > 0")
+    if _as_int(profile["point_space"]) <= 0:
+        bad("point_space must be > 0")
+    if _as_int(profile["dimension"]) <= 0:
+        bad("dimension must be > 0")
+    if _as_float(profile["timeout_seconds"]) <= 0:
+        bad("timeout_seconds must be > 0")
+
+
+def load_profiles() -> list[dict[str, object]]:
+    defaults = default_profiles()
+    raw_json = os.environ.get("AIONBD_SOAK_PROFILES_JSON", "").strip()
+    if not raw_json:
+        profiles = defaults
+    else:
+        parsed = json.loads(raw_json)
+        if not isinstance(parsed, list):
+            raise ValueError("AIONBD_SOAK_PROFILES_JSON must be a JSON list")
+        base = defaults[0]
+        profiles = []
+        for item in parsed:
+            if isinstance(item, dict):
+                profile = base.copy()
+                profile.update(item)
+                profiles.append(profile)
+    if not profiles:
+        raise ValueError("no soak profiles configured")
+    for profile in profiles:
+        validate_profile(profile)
+    return profiles
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Thread-based soak workers, vector pools and SDK client setup."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+try:
+    from soak_metrics import WorkerStats
+except ModuleNotFoundError:
+    from scripts.soak_metrics import WorkerStats
+
+# The SDK import (and the sys.path change it needs) happens once at module
+# import time, not inside every worker thread.
+SDK_ROOT = Path(__file__).resolve().parents[1] / "sdk" / "python"
+if str(SDK_ROOT) not in sys.path:
+    sys.path.insert(0, str(SDK_ROOT))
+
+from aionbd import AionBDClient  # noqa: E402  # pylint: disable=import-error
+
+VECTOR_POOL_SIZE = 1024
+# A partially filled write batch is flushed once its oldest point is this old.
+WRITE_BATCH_MAX_DELAY_SECONDS = 0.05
+
+
+def make_client(base_url: str, timeout: float) -> AionBDClient:
+    return AionBDClient(base_url=base_url, timeout=timeout, keepalive=True)
+
+
+def vector_pool(seed: int, dimension: int) -> list[list[float]]:
+    """Pre-generate a seeded pool of vectors so ops do not pay for RNG calls.
+
+    Always uses `random.Random` so a seed yields the same vectors whether or
+    not numpy is installed.
+    """
+    rng = random.Random(seed)
+    return [
+        [rng.uniform(-1.0, 1.0) for _ in range(dimension)]
+        for _ in range(VECTOR_POOL_SIZE)
+    ]
+
+
+def flush_write_batch(
+    client: Any,
+    collection: str,
+    batch: list[tuple[int, list[float], dict[str, Any] | None]],
+    stats: WorkerStats,
+) -> None:
+    start = time.perf_counter()
+    error = False
+    try:
+        client.upsert_points_batch(collection, batch)
+    except Exception:  # noqa: BLE001
+        error = True
+    stats.record_batch(int((time.perf_counter() - start) * 1_000_000), len(batch), error)
+    batch.clear()
+
+
+def worker_loop(
+    worker_id: int,
+    args: argparse.Namespace,
+    stop_event: threading.Event,
+    stats: WorkerStats,
+    measure_from: float,
+) -> None:
+    client = make_client(args.base_url, args.timeout_seconds)
+    # Starts are spread over the warm-up window; ops issued before
+    # `measure_from` go to a throwaway sink so cold-start latency is not reported.
+    if stop_event.wait(worker_id * args.warmup_seconds / args.workers):
+        return
+    sink = WorkerStats()
+    rng = random.Random(args.seed + worker_id)
+    vectors = vector_pool(args.seed + worker_id, args.dimension)
+    vector_index = 0
+    batch: list[tuple[int, list[float], dict[str, Any] | None]] = []
+    batch_started = 0.0
+    # Payload timestamps come from perf_counter readings the loop already takes
+    # (the end of the previous op) shifted to the epoch, not a time.time() call.
+    epoch_offset_ms = (time.time() - time.perf_counter()) * 1000
+    now = time.perf_counter()
+
+    while not stop_event.is_set():
+        if sink is not stats and now >= measure_from:
+            sink = stats
+        vector = vectors[vector_index]
+        vector_index = (vector_index + 1) % VECTOR_POOL_SIZE
+        op_is_write = rng.random() < args.write_ratio
+        op = "write" if op_is_write else "read"
+        if op_is_write:
+            point_id = rng.randint(1, args.point_space)
+            payload = {
+                "worker": worker_id,
+                "sequence": rng.randint(1, 1_000_000_000),
+                "ts_ms": int(epoch_offset_ms + now * 1000),
+            }
+            if args.write_batch_size > 1:
+                if not batch:
+                    batch_started = now
+                batch.append((point_id, vector, payload))
+                if (
+                    len(batch) >= args.write_batch_size
+                    or now - batch_started >= WRITE_BATCH_MAX_DELAY_SECONDS
+                ):
+                    flush_write_batch(client, args.collection, batch, sink)
+                now = time.perf_counter()
+                continue
+        start = time.perf_counter()
+        error = False
+        try:
+            if op_is_write:
+                client.upsert_point(args.collection, point_id, vector, payload=payload)
+            else:
+                client.search_collection_top_k(
+                    args.collection,
+                    vector,
+                    limit=args.search_limit,
+                    metric=args.metric,
+                    mode=args.search_mode,
+                )
+        except Exception:  # noqa: BLE001
+            error = True
+        now = time.perf_counter()
+        sink.record(op, int((now - start) * 1_000_000), error)
+
+    if batch:
+        flush_write_batch(client, args.collection, batch, sink)
+
+
+def run_thread_workers(
+    args: argparse.Namespace, worker_stats: list[WorkerStats], measure_from: float
+) -> None:
+    stop_event = threading.Event()
+    threads = []
+    for worker_id in range(args.workers):
+        thread = threading.Thread(
+            target=worker_loop,
+            args=(worker_id, args, stop_event, worker_stats[worker_id], measure_from),
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+
+    time.sleep(max(0.0, measure_from + args.duration_seconds - time.perf_counter()))
+    stop_event.set()
+    for thread in threads:
+        thread.join(timeout=10)
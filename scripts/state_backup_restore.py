@@ -5,52 +5,56 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
-import hashlib
 import json
 import shutil
 import sys
-import tarfile
 import tempfile
 from pathlib import Path
 
+try:
+    from backup_io import (
+        ARCHIVE_SUFFIXES,
+        HASH_CACHE_NAME,
+        HashCache,
+        add_bytes_member,
+        add_hashed_file,
+        copy_file,
+        open_archive_reader,
+        open_archive_writer,
+        safe_extract_archive,
+        verify_archive_files,
+        zstandard,
+    )
+except ModuleNotFoundError:
+    from scripts.backup_io import (
+        ARCHIVE_SUFFIXES,
+        HASH_CACHE_NAME,
+        HashCache,
+        add_bytes_member,
+        add_hashed_file,
+        copy_file,
+        open_archive_reader,
+        open_archive_writer,
+        safe_extract_archive,
+        verify_archive_files,
+        zstandard,
+    )
+
 FORMAT_VERSION = 1
 DEFAULT_SNAPSHOT_PATH = str(Path.cwd() / "data" / "aionbd_snapshot.json")
 DEFAULT_WAL_PATH = str(Path.cwd() / "data" / "aionbd_wal.jsonl")
 
-def default_backup_path() -> str:
+def default_backup_path(compression: str = "gzip") -> str:
     stamp = dt.datetime.now(dt.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-    return str(Path.cwd() / "backups" / f"aionbd-backup-{stamp}.tar.gz")
+    suffix = ARCHIVE_SUFFIXES[compression]
+    return str(Path.cwd() / "backups" / f"aionbd-backup-{stamp}{suffix}")
 
 def incremental_dir(snapshot_path: Path) -> Path:
     return snapshot_path.with_suffix(".incrementals")
 
-def sha256_file(path: Path) -> str:
-    hasher = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            hasher.update(chunk)
-    return hasher.hexdigest()
-
-def copy_file(src: Path, dst: Path) -> None:
-    dst.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(src, dst)
-
 def build_manifest(
-    staging_root: Path, snapshot_path: Path, wal_path: Path
+    entries: list[dict[str, object]], snapshot_path: Path, wal_path: Path
 ) -> dict[str, object]:
-    entries: list[dict[str, object]] = []
-    for path in sorted(staging_root.rglob("*")):
-        if not path.is_file():
-            continue
-        relative = path.relative_to(staging_root).as_posix()
-        entries.append(
-            {
-                "path": relative,
-                "size_bytes": path.stat().st_size,
-                "sha256": sha256_file(path),
-            }
-        )
-
     return {
         "format_version": FORMAT_VERSION,
         "created_at_utc": dt.datetime.now(dt.timezone.utc).isoformat(),
@@ -59,60 +63,71 @@ def build_manifest(
             "wal_path": str(wal_path),
             "incremental_path": str(incremental_dir(snapshot_path)),
         },
-        "entries": entries,
+        "entries": sorted(entries, key=lambda entry: str(entry["path"])),
     }
 
-def backup(snapshot_path: Path, wal_path: Path, output: Path) -> int:
+def backup(
+    snapshot_path: Path, wal_path: Path, output: Path, compression: str = "gzip"
+) -> int:
     incremental_path = incremental_dir(snapshot_path)
+    sources: list[tuple[Path, str]] = []
+
+    if snapshot_path.exists():
+        if not snapshot_path.is_file():
+            print(f"error=invalid_snapshot_path path={snapshot_path}", file=sys.stderr)
+            return 1
+        sources.append((snapshot_path, "snapshot.json"))
 
-    with tempfile.TemporaryDirectory(prefix="aionbd_backup_stage_") as temp_dir:
-        staging_root = Path(temp_dir)
-        copied_anything = False
-
-        if snapshot_path.exists():
-            if not snapshot_path.is_file():
-                print(
-                    f"error=invalid_snapshot_path path={snapshot_path}", file=sys.stderr
-                )
-                return 1
-            copy_file(snapshot_path, staging_root / "snapshot.json")
-            copied_anything = True
-
-        if wal_path.exists():
-            if not wal_path.is_file():
-                print(f"error=invalid_wal_path path={wal_path}", file=sys.stderr)
-                return 1
-            copy_file(wal_path, staging_root / "wal.jsonl")
-            copied_anything = True
-
-        if incremental_path.exists():
-            if not incremental_path.is_dir():
-                print(
-                    f"error=invalid_incremental_path path={incremental_path}",
-                    file=sys.stderr,
-                )
-                return 1
-            shutil.copytree(incremental_path, staging_root / "incrementals")
-            copied_anything = True
-
-        if not copied_anything:
+    if wal_path.exists():
+        if not wal_path.is_file():
+            print(f"error=invalid_wal_path path={wal_path}", file=sys.stderr)
+            return 1
+        sources.append((wal_path, "wal.jsonl"))
+
+    if incremental_path.exists():
+        if not incremental_path.is_dir():
             print(
-                "error=no_persistence_files_found "
-                f"snapshot={snapshot_path} wal={wal_path} incremental={incremental_path}",
+                f"error=invalid_incremental_path path={incremental_path}",
                 file=sys.stderr,
             )
             return 1
-
-        manifest = build_manifest(staging_root, snapshot_path, wal_path)
-        (staging_root / "manifest.json").write_text(
-            json.dumps(manifest, indent=2, sort_keys=False) + "\n",
-            encoding="utf-8",
+        sources.append((incremental_path, "incrementals"))
+        for path in sorted(incremental_path.rglob("*")):
+            if path.name in (HASH_CACHE_NAME, f".{HASH_CACHE_NAME}.tmp"):
+                continue
+            arcname = f"incrementals/{path.relative_to(incremental_path).as_posix()}"
+            sources.append((path, arcname))
+
+    if not sources:
+        print(
+            "error=no_persistence_files_found "
+            f"snapshot={snapshot_path} wal={wal_path} incremental={incremental_path}",
+            file=sys.stderr,
         )
+        return 1
 
-        output.parent.mkdir(parents=True, exist_ok=True)
-        with tarfile.open(output, mode="w:gz") as archive:
-            for path in sorted(staging_root.rglob("*")):
-                archive.add(path, arcname=path.relative_to(staging_root))
+    # Sources are streamed straight into the archive (no staging copy); each
+    # file is read once and hashed as it is written, and the manifest built
+    # from those hashes is appended as the last member.
+    # Unchanged files (same mtime_ns and size) reuse the previous backup's
+    # digest from a sidecar cache kept in the incrementals dir, when it exists.
+    output.parent.mkdir(parents=True, exist_ok=True)
+    cache = HashCache(incremental_path / HASH_CACHE_NAME)
+    entries: list[dict[str, object]] = []
+    with open_archive_writer(output, compression) as archive:
+        for path, arcname in sources:
+            if path.is_dir():
+                archive.add(path, arcname=arcname, recursive=False)
+            elif path.is_file():
+                entries.append(add_hashed_file(archive, path, arcname, cache))
+        manifest = build_manifest(entries, snapshot_path, wal_path)
+        manifest_text = json.dumps(manifest, indent=2, sort_keys=False) + "\n"
+        add_bytes_member(archive, "manifest.json", manifest_text.encode("utf-8"))
+    if incremental_path.is_dir():
+        try:
+            cache.save()
+        except OSError as error:
+            print(f"warning=hash_cache_not_saved detail={error}", file=sys.stderr)
 
     print(
         "ok=backup_created "
@@ -142,48 +157,6 @@ def load_manifest(extract_root: Path) -> dict[str, object]:
 
     return manifest
 
-def verify_archive_files(extract_root: Path, manifest: dict[str, object]) -> None:
-    entries = manifest["entries"]
-    assert isinstance(entries, list)
-
-    for entry in entries:
-        if not isinstance(entry, dict):
-            raise ValueError("manifest entry must be an object")
-
-        relative = entry.get("path")
-        expected_size = entry.get("size_bytes")
-        expected_hash = entry.get("sha256")
-        if not isinstance(relative, str):
-            raise ValueError("manifest entry path must be a string")
-        if not isinstance(expected_size, int):
-            raise ValueError("manifest entry size_bytes must be an int")
-        if not isinstance(expected_hash, str):
-            raise ValueError("manifest entry sha256 must be a string")
-
-        actual = extract_root / relative
-        if not actual.exists() or not actual.is_file():
-            raise ValueError(f"archive entry is missing: {relative}")
-
-        actual_size = actual.stat().st_size
-        if actual_size != expected_size:
-            raise ValueError(
-                f"size mismatch for {relative}: actual={actual_size} expected={expected_size}"
-            )
-
-        actual_hash = sha256_file(actual)
-        if actual_hash != expected_hash:
-            raise ValueError(
-                f"sha256 mismatch for {relative}: actual={actual_hash} expected={expected_hash}"
-            )
-
-def safe_extract_archive(archive: tarfile.TarFile, destination: Path) -> None:
-    destination_root = destination.resolve()
-    for member in archive.getmembers():
-        target = (destination / member.name).resolve()
-        if not target.is_relative_to(destination_root):
-            raise ValueError(f"archive contains unsafe path: {member.name}")
-    archive.extractall(path=destination)
-
 def restore(
     input_archive: Path, snapshot_path: Path, wal_path: Path, force: bool
 ) -> int:
@@ -196,16 +169,19 @@ def restore(
 
     with tempfile.TemporaryDirectory(prefix="aionbd_restore_stage_") as temp_dir:
         extract_root = Path(temp_dir)
-        with tarfile.open(input_archive, mode="r:gz") as archive:
-            try:
-                safe_extract_archive(archive, extract_root)
-            except ValueError as error:
-                print(f'error=invalid_backup_archive detail="{error}"', file=sys.stderr)
-                return 1
+        try:
+            with open_archive_reader(input_archive) as archive:
+                extracted = safe_extract_archive(archive, extract_root)
+        except RuntimeError as error:
+            print(f'error=unsupported_backup_archive detail="{error}"', file=sys.stderr)
+            return 1
+        except ValueError as error:
+            print(f'error=invalid_backup_archive detail="{error}"', file=sys.stderr)
+            return 1
 
         try:
             manifest = load_manifest(extract_root)
-            verify_archive_files(extract_root, manifest)
+            verify_archive_files(manifest, extracted)
         except ValueError as error:
             print(f'error=invalid_backup_archive detail="{error}"', file=sys.stderr)
             return 1
@@ -243,12 +219,12 @@ def restore(
         for src, dst in restore_plan:
             dst.parent.mkdir(parents=True, exist_ok=True)
             if src.is_dir():
-                shutil.copytree(src, dst)
+                shutil.copytree(src, dst, copy_function=copy_file)
             else:
                 temp_target = dst.with_suffix(dst.suffix + ".restore_tmp")
                 if temp_target.exists():
                     temp_target.unlink()
-                shutil.copy2(src, temp_target)
+                copy_file(src, temp_target)
                 temp_target.replace(dst)
 
     print(
@@ -268,7 +244,15 @@ def parse_args() -> argparse.Namespace:
     backup_parser = subparsers.add_parser("backup", help="Create backup archive")
     backup_parser.add_argument("--snapshot-path", default=DEFAULT_SNAPSHOT_PATH)
     backup_parser.add_argument("--wal-path", default=DEFAULT_WAL_PATH)
-    backup_parser.add_argument("--output", default=default_backup_path())
+    backup_parser.add_argument(
+        "--compression",
+        choices=sorted(ARCHIVE_SUFFIXES),
+        default="gzip",
+        help="zstd is multithreaded and much faster; needs the zstandard package",
+    )
+    backup_parser.add_argument(
+        "--output", help="default: backups/aionbd-backup-<utc-stamp>.tar.gz|.tar.zst"
+    )
 
     restore_parser = subparsers.add_parser("restore", help="Restore backup archive")
     restore_parser.add_argument("--input", required=True)
@@ -282,10 +266,14 @@ def main() -> int:
     args = parse_args()
 
     if args.command == "backup":
+        if args.compression == "zstd" and zstandard is None:
+            print("error=zstd_unavailable install=zstandard", file=sys.stderr)
+            return 1
         return backup(
             snapshot_path=Path(args.snapshot_path),
             wal_path=Path(args.wal_path),
-            output=Path(args.output),
+            output=Path(args.output or default_backup_path(args.compression)),
+            compression=args.compression,
         )
     return restore(
         input_archive=Path(args.input),
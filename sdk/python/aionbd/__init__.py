@@ -1,27 +1,18 @@
 """Python SDK for AIONBD."""
 
+from ._collection import CollectionHandle
+from ._semantic_cache import SemanticCacheConfig
+from .aclient import AsyncAionBDClient
 from .client import AionBDClient
 from .errors import AionBDError
-from .models import (
-    CollectionInfo,
-    DeleteCollectionResult,
-    DeletePointResult,
-    DistanceResult,
-    MetricsResult,
-    PointResult,
-    SearchResult,
-    UpsertPointResult,
-)
+from .models import *  # noqa: F403
+from .models import __all__ as _models_all
 
 __all__ = [
     "AionBDClient",
+    "AsyncAionBDClient",
     "AionBDError",
-    "DistanceResult",
-    "SearchResult",
-    "CollectionInfo",
-    "DeleteCollectionResult",
-    "UpsertPointResult",
-    "PointResult",
-    "MetricsResult",
-    "DeletePointResult",
+    "CollectionHandle",
+    "SemanticCacheConfig",
+    *_models_all,
 ]
@@ -0,0 +1,39 @@
+"""JSON encoding for request and response bodies (orjson when installed)."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _tolist(value: Any) -> Any:
+    tolist = getattr(value, "tolist", None)
+    if tolist is None:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    return tolist()
+
+
+def dumps(value: Any) -> bytes:
+    """Serializes a request body straight to UTF-8 bytes.
+
+    Vectors may be lists, `array('d')` or numpy arrays. With orjson, numpy
+    float arrays are written from their buffer in C without boxing a Python
+    float per element; anything else with a `tolist()` is converted first.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            value, default=_tolist, option=orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(value, default=_tolist).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    """Parses a response body without decoding it to `str` first."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
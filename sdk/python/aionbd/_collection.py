@@ -0,0 +1,154 @@
+"""Per-collection request builders shared by the flat client methods."""
+
+from __future__ import annotations
+
+import functools
+import urllib.parse
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, Union
+
+from ._parsers import (
+    check_point_values_format,
+    parse_delete_point,
+    parse_list_points,
+    parse_point,
+    parse_search,
+    parse_search_hits,
+    parse_upsert_point,
+    parse_upsert_points_batch,
+)
+from .models import (
+    DeletePointResult,
+    PointResult,
+    SearchResult,
+    UpsertPointResult,
+    UpsertPointsBatchResult,
+)
+
+if TYPE_CHECKING:
+    import numpy
+
+    from ._endpoints import EndpointMethods
+
+# Query/point vectors: a list, `array('d')` or a numpy float array.
+Vector = Union[Sequence[float], "numpy.ndarray"]
+PointItem = tuple[int, Vector, "dict[str, Any] | None"]
+
+# list_points query strings keyed by (limit given, cursor mode).
+_LIST_POINTS_QUERIES = {
+    (True, False): "?limit=%d&offset=%d",
+    (True, True): "?limit=%d&after_id=%d",
+    (False, False): "?offset=%d",
+    (False, True): "?after_id=%d",
+}
+
+
+@functools.lru_cache(maxsize=256)
+def escape_segment(value: str) -> str:
+    return urllib.parse.quote(value.strip(), safe="")
+
+
+class CollectionHandle:
+    """Point and search methods bound to one collection.
+
+    Obtained from `client.collection(name)`; the escaped URL prefix is built
+    once, so hot loops on a fixed collection skip re-quoting its name. On an
+    `AsyncAionBDClient` handle every method must be awaited.
+    """
+
+    __slots__ = ("_client", "name", "path")
+
+    def __init__(self, client: EndpointMethods, name: str) -> None:
+        self._client = client
+        self.name = name
+        self.path = f"/collections/{escape_segment(name)}"
+
+    def search(
+        self,
+        query: Vector,
+        metric: str = "dot",
+        mode: str = "auto",
+        target_recall: float | None = None,
+        filter: dict[str, Any] | None = None,
+    ) -> SearchResult:
+        """Runs top-1 search using the selected metric."""
+        body: dict[str, Any] = {"query": query, "metric": metric, "mode": mode}
+        if target_recall is not None:
+            body["target_recall"] = float(target_recall)
+        if filter is not None:
+            body["filter"] = filter
+        return self._client._search(f"{self.path}/search", body, parse_search)
+
+    def search_top_k(
+        self,
+        query: Vector,
+        limit: int | None = 10,
+        metric: str = "dot",
+        mode: str = "auto",
+        target_recall: float | None = None,
+        filter: dict[str, Any] | None = None,
+    ) -> list[SearchResult]:
+        """Runs top-k search; `limit=None` lets server defaults apply."""
+        body: dict[str, Any] = {"query": query, "metric": metric, "mode": mode}
+        if limit is not None:
+            limit = int(limit)
+            if limit <= 0:
+                raise ValueError("limit must be > 0")
+            body["limit"] = limit
+        if target_recall is not None:
+            body["target_recall"] = float(target_recall)
+        if filter is not None:
+            body["filter"] = filter
+        parse = functools.partial(parse_search_hits, mode_fallback=mode)
+        return self._client._search(f"{self.path}/search/topk", body, parse)
+
+    def upsert_point(
+        self, point_id: int, values: Vector, payload: dict[str, Any] | None = None
+    ) -> UpsertPointResult:
+        """Creates or updates a point."""
+        body: dict[str, Any] = {"values": values}
+        if payload is not None:
+            body["payload"] = payload
+        path = f"{self.path}/points/{point_id}"
+        return self._client._call("PUT", path, body, parse_upsert_point)
+
+    def upsert_points_batch(self, points: list[PointItem]) -> UpsertPointsBatchResult:
+        """Creates or updates several `(point_id, values, payload)` items at once."""
+        items: list[dict[str, Any]] = []
+        for point_id, values, payload in points:
+            item: dict[str, Any] = {"id": int(point_id), "values": values}
+            if payload is not None:
+                item["payload"] = payload
+            items.append(item)
+        path = f"{self.path}/points"
+        return self._client._call("POST", path, {"points": items}, parse_upsert_points_batch)
+
+    def get_point(self, point_id: int, values_as: str = "list") -> PointResult:
+        """Reads a point; see `AionBDClient.get_point` for `values_as`."""
+        check_point_values_format(values_as)
+        parse = functools.partial(parse_point, values_as=values_as)
+        return self._client._call("GET", f"{self.path}/points/{point_id}", None, parse)
+
+    def list_points(
+        self, offset: int = 0, limit: int | None = 100, after_id: int | None = None
+    ) -> dict[str, Any]:
+        """Lists point ids with pagination metadata (offset or cursor mode)."""
+        cursor = after_id is not None
+        if cursor and offset != 0:
+            raise ValueError("offset must be 0 when after_id is provided")
+        start = int(after_id) if cursor else int(offset)
+
+        if limit is None:
+            query = _LIST_POINTS_QUERIES[False, cursor] % start
+        else:
+            limit = int(limit)
+            if limit <= 0:
+                raise ValueError("limit must be > 0")
+            query = _LIST_POINTS_QUERIES[True, cursor] % (limit, start)
+        path = f"{self.path}/points{query}"
+        return self._client._call("GET", path, None, parse_list_points)
+
+    def delete_point(self, point_id: int) -> DeletePointResult:
+        """Deletes a point."""
+        path = f"{self.path}/points/{point_id}"
+        return self._client._call("DELETE", path, None, parse_delete_point)
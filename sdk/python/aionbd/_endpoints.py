@@ -0,0 +1,248 @@
+"""AIONBD endpoint methods shared by the sync and async clients."""
+
+from __future__ import annotations
+
+import itertools
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from types import MappingProxyType
+from typing import Any
+
+from ._codec import dumps, loads
+from ._collection import CollectionHandle, PointItem, Vector, escape_segment
+from ._parsers import (
+    parse_collection,
+    parse_collection_list,
+    parse_delete_collection,
+    parse_distance,
+    parse_metrics,
+)
+from .models import (
+    CollectionInfo,
+    DeleteCollectionResult,
+    DeletePointResult,
+    DistanceResult,
+    MetricsResult,
+    PointResult,
+    SearchResult,
+    UpsertPointResult,
+    UpsertPointsBatchResult,
+)
+
+
+# Request headers are shared, read-only mappings instead of a new dict per call.
+# gzip responses (e.g. from a compressing reverse proxy) are decoded by the
+# transports; httpx does the same for the async client.
+_JSON_GET_HEADERS = MappingProxyType(
+    {"Accept": "application/json", "Accept-Encoding": "gzip"}
+)
+_JSON_BODY_HEADERS = MappingProxyType(
+    {
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip",
+        "Content-Type": "application/json",
+    }
+)
+_RAW_GET_HEADERS = MappingProxyType({"Accept": "text/plain", "Accept-Encoding": "gzip"})
+_RAW_BODY_HEADERS = MappingProxyType(
+    {
+        "Accept": "text/plain",
+        "Accept-Encoding": "gzip",
+        "Content-Type": "application/json",
+    }
+)
+
+
+def _as_object(payload: Any) -> dict[str, Any]:
+    return payload if isinstance(payload, dict) else {"raw": payload}
+
+
+def _identity(payload: Any) -> Any:
+    return payload
+
+
+# Server default for `AIONBD_UPSERT_BATCH_MAX_POINTS`; larger batches get HTTP 400.
+DEFAULT_BULK_CHUNK_SIZE = 256
+
+
+def chunked_points(
+    points: Iterable[PointItem], chunk_size: int
+) -> Iterator[list[PointItem]]:
+    """Splits points into lists of at most `chunk_size`, consuming lazily."""
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be > 0")
+    iterator = iter(points)
+    while chunk := list(itertools.islice(iterator, chunk_size)):
+        yield chunk
+
+
+class EndpointMethods:
+    """Builds each API request and names the parser for its response.
+
+    Subclasses implement `_call(method, path, body, parse, raw)`: the sync
+    client returns the parsed result, the async client a coroutine of it, so
+    on `AsyncAionBDClient` every method below must be awaited. Point and
+    search methods delegate to a `CollectionHandle`.
+    """
+
+    def _call(
+        self,
+        method: str,
+        path: str,
+        body: dict[str, Any] | None,
+        parse: Callable[[Any], Any],
+        raw: bool = False,
+    ) -> Any:
+        raise NotImplementedError
+
+    def _search(
+        self, path: str, body: dict[str, Any], parse: Callable[[Any], Any]
+    ) -> Any:
+        return self._call("POST", path, body, parse)
+
+    def collection(self, name: str) -> CollectionHandle:
+        """Returns point/search methods bound to `name` with a prebuilt URL prefix."""
+        return CollectionHandle(self, name)
+
+    def live(self) -> dict[str, Any]:
+        """Returns liveness and uptime metadata."""
+        return self._call("GET", "/live", None, _as_object)
+
+    def ready(self) -> dict[str, Any]:
+        """Returns readiness checks and uptime metadata."""
+        return self._call("GET", "/ready", None, _as_object)
+
+    def metrics(self) -> MetricsResult:
+        """Returns runtime counters and server state indicators."""
+        return self._call("GET", "/metrics", None, parse_metrics)
+
+    def metrics_prometheus(self) -> str:
+        """Returns runtime counters in Prometheus text exposition format."""
+        return self._call("GET", "/metrics/prometheus", None, _identity, raw=True)
+
+    def health(self) -> dict[str, Any]:
+        """Backward-compatible alias using readiness endpoint."""
+        return self.ready()
+
+    def distance(
+        self, left: Vector, right: Vector, metric: str = "dot"
+    ) -> DistanceResult:
+        """Computes a distance/similarity value through the API."""
+        body = {"left": left, "right": right, "metric": metric}
+        return self._call("POST", "/distance", body, parse_distance)
+
+    def create_collection(
+        self, name: str, dimension: int, strict_finite: bool = True
+    ) -> CollectionInfo:
+        """Creates an in-memory collection."""
+        body = {"name": name, "dimension": dimension, "strict_finite": strict_finite}
+        return self._call("POST", "/collections", body, parse_collection)
+
+    def list_collections(self) -> list[CollectionInfo]:
+        """Lists all collections."""
+        return self._call("GET", "/collections", None, parse_collection_list)
+
+    def get_collection(self, name: str) -> CollectionInfo:
+        """Reads collection metadata."""
+        path = f"/collections/{self._escaped(name)}"
+        return self._call("GET", path, None, parse_collection)
+
+    def search_collection(
+        self,
+        collection: str,
+        query: Vector,
+        metric: str = "dot",
+        mode: str = "auto",
+        target_recall: float | None = None,
+        filter: dict[str, Any] | None = None,
+    ) -> SearchResult:
+        """Runs top-1 search in a collection using the selected metric."""
+        return CollectionHandle(self, collection).search(
+            query, metric, mode, target_recall, filter
+        )
+
+    def search_collection_top_k(
+        self,
+        collection: str,
+        query: Vector,
+        limit: int | None = 10,
+        metric: str = "dot",
+        mode: str = "auto",
+        target_recall: float | None = None,
+        filter: dict[str, Any] | None = None,
+    ) -> list[SearchResult]:
+        """Runs top-k search in a collection using the selected metric.
+
+        Set `limit=None` to omit the field and let server defaults apply.
+        """
+        return CollectionHandle(self, collection).search_top_k(
+            query, limit, metric, mode, target_recall, filter
+        )
+
+    def upsert_point(
+        self,
+        collection: str,
+        point_id: int,
+        values: Vector,
+        payload: dict[str, Any] | None = None,
+    ) -> UpsertPointResult:
+        """Creates or updates a point in a collection."""
+        return CollectionHandle(self, collection).upsert_point(point_id, values, payload)
+
+    def upsert_points_batch(
+        self, collection: str, points: list[PointItem]
+    ) -> UpsertPointsBatchResult:
+        """Creates or updates several points in one request.
+
+        Each item is `(point_id, values, payload)`; pass `None` to omit a payload.
+        """
+        return CollectionHandle(self, collection).upsert_points_batch(points)
+
+    def get_point(
+        self, collection: str, point_id: int, values_as: str = "list"
+    ) -> PointResult:
+        """Reads a point payload from a collection.
+
+        `values_as="array"` returns values as a compact float32 `array('f')`,
+        and `values_as="numpy"` as a float32 numpy array (requires numpy).
+        """
+        return CollectionHandle(self, collection).get_point(point_id, values_as)
+
+    def list_points(
+        self,
+        collection: str,
+        offset: int = 0,
+        limit: int | None = 100,
+        after_id: int | None = None,
+    ) -> dict[str, Any]:
+        """Lists point ids with pagination metadata (offset or cursor mode).
+
+        Set `limit=None` to omit the query parameter and let server defaults apply.
+        """
+        return CollectionHandle(self, collection).list_points(offset, limit, after_id)
+
+    def delete_point(self, collection: str, point_id: int) -> DeletePointResult:
+        """Deletes a point from a collection."""
+        return CollectionHandle(self, collection).delete_point(point_id)
+
+    def delete_collection(self, name: str) -> DeleteCollectionResult:
+        """Deletes a collection."""
+        path = f"/collections/{self._escaped(name)}"
+        return self._call("DELETE", path, None, parse_delete_collection)
+
+    @staticmethod
+    def _encode_request(
+        body: dict[str, Any] | None, raw: bool
+    ) -> tuple[bytes | None, Mapping[str, str]]:
+        if body is None:
+            return None, _RAW_GET_HEADERS if raw else _JSON_GET_HEADERS
+        return dumps(body), _RAW_BODY_HEADERS if raw else _JSON_BODY_HEADERS
+
+    @staticmethod
+    def _decode_response(payload: bytes, raw: bool) -> Any:
+        if raw:
+            return payload.decode("utf-8")
+        return {} if not payload else loads(payload)
+
+    @staticmethod
+    def _escaped(value: str) -> str:
+        return escape_segment(value)
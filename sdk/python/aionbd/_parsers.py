@@ -2,8 +2,19 @@
 
 from __future__ import annotations
 
+from array import array
 from typing import Any
 
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from .errors import AionBDError
 from .models import (
     CollectionInfo,
@@ -14,11 +25,30 @@ from .models import (
     PointResult,
     SearchResult,
     UpsertPointResult,
+    UpsertPointsBatchResult,
 )
 
+# Errors a malformed response can raise while parsing; each parser maps them
+# to `AionBDError`.
+_PARSE_ERRORS: tuple[type[Exception], ...] = (KeyError, TypeError, ValueError)
+
+POINT_VALUES_FORMATS = ("list", "array", "numpy")
+
+if msgspec is not None:
+    # With msgspec installed, metrics and point responses are validated and
+    # coerced in C through `msgspec.convert` instead of per-field Python casts.
+    _PARSE_ERRORS += (msgspec.ValidationError,)
+
+    class _PointMsg(msgspec.Struct):
+        id: int
+        values: list[float]
+        payload: dict[str, Any] | None = None
+
 
 def parse_metrics(payload: Any) -> MetricsResult:
     try:
+        if msgspec is not None:
+            return msgspec.convert(payload, type=MetricsResult, strict=False)
         return MetricsResult(
             uptime_ms=int(payload["uptime_ms"]),
             ready=bool(payload["ready"]),
@@ -40,7 +70,7 @@ def parse_metrics(payload: Any) -> MetricsResult:
             persistence_enabled=bool(payload["persistence_enabled"]),
             persistence_writes=int(payload["persistence_writes"]),
         )
-    except (KeyError, TypeError, ValueError) as exc:
+    except _PARSE_ERRORS as exc:
         raise AionBDError(f"invalid metrics response: {payload}") from exc
 
 
@@ -49,7 +79,7 @@ def parse_distance(payload: Any) -> DistanceResult:
         return DistanceResult(
             metric=str(payload["metric"]), value=float(payload["value"])
         )
-    except (KeyError, TypeError, ValueError) as exc:
+    except _PARSE_ERRORS as exc:
         raise AionBDError(f"invalid distance response: {payload}") from exc
 
 
@@ -61,10 +91,17 @@ def parse_collection(payload: Any) -> CollectionInfo:
             strict_finite=bool(payload["strict_finite"]),
             point_count=int(payload["point_count"]),
         )
-    except (KeyError, TypeError, ValueError) as exc:
+    except _PARSE_ERRORS as exc:
         raise AionBDError(f"invalid collection response: {payload}") from exc
 
 
+def parse_collection_list(payload: Any) -> list[CollectionInfo]:
+    try:
+        return [parse_collection(item) for item in payload["collections"]]
+    except _PARSE_ERRORS as exc:
+        raise AionBDError(f"invalid list collections response: {payload}") from exc
+
+
 def parse_search(payload: Any) -> SearchResult:
     try:
         recall_raw = payload.get("recall_at_k")
@@ -76,10 +113,22 @@ def parse_search(payload: Any) -> SearchResult:
             recall_at_k=None if recall_raw is None else float(recall_raw),
             payload=payload.get("payload"),
         )
-    except (KeyError, TypeError, ValueError) as exc:
+    except _PARSE_ERRORS as exc:
         raise AionBDError(f"invalid search response: {payload}") from exc
 
 
+# Top-k responses can hold thousands of hits, so they skip the frozen
+# dataclass __init__ (one object.__setattr__ per field) and fill the slots
+# through their member descriptors; instances are identical to constructed ones.
+_new_search_result = object.__new__
+_set_id = SearchResult.id.__set__
+_set_metric = SearchResult.metric.__set__
+_set_value = SearchResult.value.__set__
+_set_mode = SearchResult.mode.__set__
+_set_recall = SearchResult.recall_at_k.__set__
+_set_payload = SearchResult.payload.__set__
+
+
 def parse_search_hits(payload: Any, mode_fallback: str) -> list[SearchResult]:
     try:
         response_metric = str(payload["metric"])
@@ -91,18 +140,19 @@ def parse_search_hits(payload: Any, mode_fallback: str) -> list[SearchResult]:
         hits = payload["hits"]
         if not isinstance(hits, list):
             raise TypeError("hits must be a list")
-        return [
-            SearchResult(
-                id=int(hit["id"]),
-                metric=response_metric,
-                value=float(hit["value"]),
-                mode=response_mode,
-                recall_at_k=response_recall,
-                payload=hit.get("payload"),
-            )
-            for hit in hits
-        ]
-    except (KeyError, TypeError, ValueError) as exc:
+        results: list[SearchResult] = []
+        append = results.append
+        for hit in hits:
+            result = _new_search_result(SearchResult)
+            _set_id(result, int(hit["id"]))
+            _set_metric(result, response_metric)
+            _set_value(result, float(hit["value"]))
+            _set_mode(result, response_mode)
+            _set_recall(result, response_recall)
+            _set_payload(result, hit.get("payload"))
+            append(result)
+        return results
+    except _PARSE_ERRORS as exc:
         raise AionBDError(f"invalid top-k search response: {payload}") from exc
 
 
@@ -111,26 +161,66 @@ def parse_upsert_point(payload: Any) -> UpsertPointResult:
         return UpsertPointResult(
             id=int(payload["id"]), created=bool(payload["created"])
         )
-    except (KeyError, TypeError, ValueError) as exc:
+    except _PARSE_ERRORS as exc:
         raise AionBDError(f"invalid upsert response: {payload}") from exc
 
 
-def parse_point(payload: Any) -> PointResult:
+def parse_upsert_points_batch(payload: Any) -> UpsertPointsBatchResult:
     try:
-        values = payload["values"]
-        if not isinstance(values, list):
-            raise TypeError("values must be a list")
+        return UpsertPointsBatchResult(
+            created=int(payload["created"]),
+            updated=int(payload["updated"]),
+            results=[
+                UpsertPointResult(id=int(item["id"]), created=bool(item["created"]))
+                for item in payload["results"]
+            ],
+        )
+    except _PARSE_ERRORS as exc:
+        raise AionBDError(f"invalid batch upsert response: {payload}") from exc
+
+
+def check_point_values_format(values_as: str) -> None:
+    if values_as not in POINT_VALUES_FORMATS:
+        raise ValueError(f"values_as must be one of {POINT_VALUES_FORMATS}")
+    if values_as == "numpy" and numpy is None:
+        raise ValueError("values_as='numpy' requires numpy")
+
+
+def _point_values(values: Any, values_as: str) -> Any:
+    """Converts point values in C: a float list, or float32 `array('f')`/numpy.
+
+    The server stores float32, so the compact formats hold every value exactly
+    at 4 bytes each instead of a 24-byte Python float.
+    """
+    if not isinstance(values, list):
+        raise TypeError("values must be a list")
+    if values_as == "array":
+        return array("f", values)
+    if values_as == "numpy":
+        return numpy.asarray(values, dtype=numpy.float32)
+    return list(map(float, values))
+
+
+def parse_point(payload: Any, values_as: str = "list") -> PointResult:
+    try:
+        if msgspec is not None:
+            message = msgspec.convert(payload, type=_PointMsg, strict=False)
+            values: Any = message.values
+            if values_as != "list":
+                values = _point_values(values, values_as)
+            return PointResult(
+                id=message.id,
+                values=values,
+                payload={} if message.payload is None else message.payload,
+            )
+        values = _point_values(payload["values"], values_as)
         metadata = payload.get("payload")
         if metadata is None:
             metadata = {}
         if not isinstance(metadata, dict):
             raise TypeError("payload must be an object")
-        return PointResult(
-            id=int(payload["id"]),
-            values=[float(value) for value in values],
-            payload=metadata,
-        )
-    except (KeyError, TypeError, ValueError) as exc:
+        return PointResult(id=int(payload["id"]), values=values, payload=metadata)
+    except _PARSE_ERRORS as exc:
         raise AionBDError(f"invalid get point response: {payload}") from exc
 
 
@@ -145,7 +235,7 @@ def parse_list_points(payload: Any) -> dict[str, Any]:
             "next_offset": None if next_offset is None else int(next_offset),
             "next_after_id": None if next_after_id is None else int(next_after_id),
         }
-    except (KeyError, TypeError, ValueError) as exc:
+    except _PARSE_ERRORS as exc:
         raise AionBDError(f"invalid list points response: {payload}") from exc
 
 
@@ -154,7 +244,7 @@ def parse_delete_point(payload: Any) -> DeletePointResult:
         return DeletePointResult(
             id=int(payload["id"]), deleted=bool(payload["deleted"])
         )
-    except (KeyError, TypeError, ValueError) as exc:
+    except _PARSE_ERRORS as exc:
         raise AionBDError(f"invalid delete point response: {payload}") from exc
 
 
@@ -164,5 +254,5 @@ def parse_delete_collection(payload: Any) -> DeleteCollectionResult:
             name=str(payload["name"]),
             deleted=bool(payload["deleted"]),
         )
-    except (KeyError, TypeError, ValueError) as exc:
+    except _PARSE_ERRORS as exc:
         raise AionBDError(f"invalid delete collection response: {payload}") from exc
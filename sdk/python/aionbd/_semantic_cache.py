@@ -0,0 +1,94 @@
+"""Opt-in client-side cache of search results keyed by query similarity."""
+
+from __future__ import annotations
+
+import math
+import operator
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+CacheKey = tuple[str, tuple[tuple[str, Any], ...]]
+
+
+@dataclass(frozen=True)
+class SemanticCacheConfig:
+    """Settings for `AionBDClient(..., semantic_cache=...)`.
+
+    A search is answered locally when an earlier search with the same path and
+    parameters had a query whose cosine similarity is at least `threshold`.
+    Lookups scan every live entry, so keep `max_entries` small.
+    """
+
+    threshold: float = 0.98
+    max_entries: int = 128
+    ttl_seconds: float = 60.0
+
+    def __post_init__(self) -> None:
+        if not 0.0 < self.threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        if self.max_entries <= 0:
+            raise ValueError("max_entries must be > 0")
+        if self.ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be > 0")
+
+
+class SemanticCache:
+    """Thread-safe LRU of `(key, unit query, result, expiry)` entries."""
+
+    def __init__(self, config: SemanticCacheConfig) -> None:
+        self.config = config
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[int, tuple[CacheKey, list[float], Any, float]] = (
+            OrderedDict()
+        )
+        self._next_slot = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def probe(path: str, body: dict[str, Any]) -> tuple[CacheKey, list[float]] | None:
+        """Returns the cache key and unit query, or None if not cacheable."""
+        if "filter" in body:
+            return None
+        query = [float(value) for value in body["query"]]
+        norm = math.sqrt(sum(map(operator.mul, query, query)))
+        if norm == 0.0 or not math.isfinite(norm):
+            return None
+        params = tuple(sorted((k, v) for k, v in body.items() if k != "query"))
+        return (path, params), [value / norm for value in query]
+
+    def lookup(self, key: CacheKey, unit: list[float]) -> Any | None:
+        now = time.monotonic()
+        threshold = self.config.threshold
+        with self._lock:
+            for slot, (entry_key, entry_unit, result, expires_at) in list(
+                self._entries.items()
+            ):
+                if expires_at <= now:
+                    del self._entries[slot]
+                elif entry_key == key and len(entry_unit) == len(unit):
+                    if sum(map(operator.mul, entry_unit, unit)) >= threshold:
+                        self._entries.move_to_end(slot)
+                        self.hits += 1
+                        return list(result) if isinstance(result, list) else result
+            self.misses += 1
+            return None
+
+    def store(self, key: CacheKey, unit: list[float], result: Any) -> None:
+        expires_at = time.monotonic() + self.config.ttl_seconds
+        with self._lock:
+            self._entries[self._next_slot] = (key, unit, result, expires_at)
+            self._next_slot += 1
+            while len(self._entries) > self.config.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
@@ -0,0 +1,177 @@
+"""HTTP transports used by the client: per-request urllib or keep-alive."""
+
+from __future__ import annotations
+
+import gzip
+import http.client
+import io
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+import zlib
+from collections.abc import Iterator, Mapping
+from typing import BinaryIO
+
+from .errors import AionBDError
+
+# Errors that mean a reused idle connection was closed by the server before
+# our request went through; the request is retried once on a fresh socket.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+def _decoded(body: bytes, content_encoding: str | None) -> bytes:
+    """Undoes gzip content coding; any other body is returned untouched."""
+    if content_encoding is None or content_encoding.strip().lower() != "gzip":
+        return body
+    try:
+        return gzip.decompress(body)
+    except (EOFError, OSError, zlib.error) as exc:
+        raise AionBDError("invalid gzip-encoded response body") from exc
+
+
+class UrllibTransport:
+    """Opens a new connection per request through `urllib.request`."""
+
+    def __init__(self, base_url: str, timeout: float) -> None:
+        self._base_url = base_url
+        self._timeout = timeout
+
+    def send(
+        self, method: str, path: str, data: bytes | None, headers: Mapping[str, str]
+    ) -> bytes:
+        """Sends a request and returns the raw body, mapping failures to errors."""
+        with self._open(method, path, data, headers) as response:
+            return _decoded(response.read(), response.headers.get("Content-Encoding"))
+
+    def iter_lines(self, path: str, headers: Mapping[str, str]) -> Iterator[str]:
+        """Streams a GET response as text lines instead of buffering the body."""
+        with self._open("GET", path, None, headers) as response:
+            stream: BinaryIO = response
+            if response.headers.get("Content-Encoding", "").strip().lower() == "gzip":
+                stream = gzip.GzipFile(fileobj=response)
+            for line in io.TextIOWrapper(stream, encoding="utf-8", newline=""):
+                yield line.rstrip("\r\n")
+
+    def close(self) -> None:
+        """Nothing to release: connections are closed after each request."""
+
+    def _open(
+        self, method: str, path: str, data: bytes | None, headers: Mapping[str, str]
+    ) -> http.client.HTTPResponse:
+        request = urllib.request.Request(
+            url=f"{self._base_url}{path}",
+            method=method,
+            data=data,
+            headers=headers,
+        )
+        try:
+            return urllib.request.urlopen(request, timeout=self._timeout)
+        except urllib.error.HTTPError as exc:
+            body = _decoded(exc.read(), exc.headers.get("Content-Encoding"))
+            detail = body.decode("utf-8", errors="replace")
+            raise AionBDError(f"HTTP {exc.code} on {method} {path}: {detail}") from exc
+        except urllib.error.URLError as exc:
+            raise AionBDError(
+                f"request failed for {method} {path}: {exc.reason}"
+            ) from exc
+
+
+class KeepAliveConnections:
+    """Keeps one HTTP connection per calling thread and reuses it across requests.
+
+    `http.client` connections are not thread-safe, so each thread gets its own
+    socket; a client shared by N threads holds at most N open connections.
+    """
+
+    def __init__(self, base_url: str, timeout: float) -> None:
+        parts = urllib.parse.urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"unsupported URL scheme for keep-alive: {base_url}")
+        self._connection_class = (
+            http.client.HTTPSConnection
+            if parts.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self._netloc = parts.netloc
+        self._path_prefix = parts.path.rstrip("/")
+        self._timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open: set[http.client.HTTPConnection] = set()
+
+    def request(
+        self, method: str, path: str, data: bytes | None, headers: Mapping[str, str]
+    ) -> tuple[int, bytes]:
+        """Sends a request and returns `(status, body)` for any HTTP status."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            try:
+                return self._round_trip(connection, method, path, data, headers)
+            except _STALE_CONNECTION_ERRORS:
+                self._discard(connection)
+            except BaseException:
+                self._discard(connection)
+                raise
+        connection = self._connect()
+        try:
+            return self._round_trip(connection, method, path, data, headers)
+        except BaseException:
+            self._discard(connection)
+            raise
+
+    def send(
+        self, method: str, path: str, data: bytes | None, headers: Mapping[str, str]
+    ) -> bytes:
+        """Sends a request and returns the raw body, mapping failures to errors."""
+        try:
+            status, body = self.request(method, path, data, headers)
+        except (OSError, http.client.HTTPException) as exc:
+            raise AionBDError(f"request failed for {method} {path}: {exc}") from exc
+        if status >= 400:
+            detail = body.decode("utf-8", errors="replace")
+            raise AionBDError(f"HTTP {status} on {method} {path}: {detail}")
+        return body
+
+    def close(self) -> None:
+        """Closes every connection opened by any thread."""
+        with self._lock:
+            connections, self._open = self._open, set()
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    def _round_trip(
+        self,
+        connection: http.client.HTTPConnection,
+        method: str,
+        path: str,
+        data: bytes | None,
+        headers: Mapping[str, str],
+    ) -> tuple[int, bytes]:
+        connection.request(
+            method, f"{self._path_prefix}{path}", body=data, headers=headers
+        )
+        response = connection.getresponse()
+        body = response.read()
+        if response.will_close:
+            self._discard(connection)
+        return response.status, _decoded(body, response.getheader("Content-Encoding"))
+
+    def _connect(self) -> http.client.HTTPConnection:
+        connection = self._connection_class(self._netloc, timeout=self._timeout)
+        with self._lock:
+            self._open.add(connection)
+        self._local.connection = connection
+        return connection
+
+    def _discard(self, connection: http.client.HTTPConnection) -> None:
+        connection.close()
+        with self._lock:
+            self._open.discard(connection)
+        if getattr(self._local, "connection", None) is connection:
+            self._local.connection = None
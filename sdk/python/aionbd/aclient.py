@@ -0,0 +1,139 @@
+"""Asyncio HTTP client for AIONBD built on `httpx` (optional dependency)."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterable
+from typing import Any
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from ._endpoints import (
+    DEFAULT_BULK_CHUNK_SIZE,
+    EndpointMethods,
+    PointItem,
+    chunked_points,
+)
+from .errors import AionBDError
+from .models import UpsertPointResult
+
+
+class AsyncAionBDClient(EndpointMethods):
+    """Async counterpart of `AionBDClient` with the same methods, awaited.
+
+    Requests share one pooled `httpx.AsyncClient`, so `asyncio.gather` over
+    many calls overlaps their round trips on a few kept-alive connections.
+    Set `http2=True` (needs `httpx[http2]`) to multiplex them over HTTPS.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://127.0.0.1:8080",
+        timeout: float = 5.0,
+        max_connections: int = 32,
+        http2: bool = False,
+    ) -> None:
+        if httpx is None:
+            raise ImportError("AsyncAionBDClient requires the httpx package")
+        self._base_url = base_url.rstrip("/")
+        self._timeout = timeout
+        self._max_connections = max_connections
+        self._client = httpx.AsyncClient(
+            base_url=self._base_url,
+            timeout=timeout,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+    async def __aenter__(self) -> AsyncAionBDClient:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Closes pooled connections."""
+        await self._client.aclose()
+
+    async def bulk_upsert_points(
+        self,
+        collection: str,
+        points: Iterable[PointItem],
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+    ) -> list[UpsertPointResult]:
+        """Upserts points as concurrent batch requests of `chunk_size`.
+
+        Chunks are pulled lazily and at most `max_connections` requests are in
+        flight, so large inputs never queue past the connection pool. Results
+        come back in input order, but chunks are applied concurrently: if an id
+        repeats across chunks, which write lands last is undefined. `chunk_size`
+        must not exceed the server's `AIONBD_UPSERT_BATCH_MAX_POINTS` (default
+        256).
+        """
+        results: list[UpsertPointResult] = []
+        in_flight: deque[asyncio.Task[Any]] = deque()
+        try:
+            for chunk in chunked_points(points, chunk_size):
+                if len(in_flight) >= self._max_connections:
+                    results.extend((await in_flight.popleft()).results)
+                in_flight.append(
+                    asyncio.ensure_future(self.upsert_points_batch(collection, chunk))
+                )
+            while in_flight:
+                results.extend((await in_flight.popleft()).results)
+        finally:
+            for task in in_flight:
+                task.cancel()
+        return results
+
+    async def iter_points(
+        self, collection: str, page_size: int = 1000
+    ) -> AsyncIterator[int]:
+        """Yields every point id (`async for`), following `after_id` cursors."""
+        points = self.collection(collection)
+        page = await points.list_points(limit=page_size)
+        while True:
+            for point_id in page["points"]:
+                yield point_id
+            after_id = page["next_after_id"]
+            if after_id is None:
+                return
+            page = await points.list_points(limit=page_size, after_id=after_id)
+
+    async def _call(
+        self,
+        method: str,
+        path: str,
+        body: dict[str, Any] | None,
+        parse: Callable[[Any], Any],
+        raw: bool = False,
+    ) -> Any:
+        return parse(await self._request(method, path, body, raw=raw))
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        body: dict[str, Any] | None = None,
+        raw: bool = False,
+    ) -> Any:
+        data, headers = self._encode_request(body, raw)
+        try:
+            response = await self._client.request(
+                method, path, content=data, headers=headers
+            )
+        except httpx.HTTPError as exc:
+            raise AionBDError(f"request failed for {method} {path}: {exc}") from exc
+        if response.status_code >= 400:
+            detail = response.content.decode("utf-8", errors="replace")
+            raise AionBDError(
+                f"HTTP {response.status_code} on {method} {path}: {detail}"
+            )
+        return self._decode_response(response.content, raw)
@@ -2,229 +2,128 @@
 
 from __future__ import annotations
 
-import json
-import urllib.error
-import urllib.parse
-import urllib.request
+from collections.abc import Callable, Iterable, Iterator
 from typing import Any
 
-from ._parsers import (
-    parse_collection,
-    parse_delete_collection,
-    parse_delete_point,
-    parse_distance,
-    parse_list_points,
-    parse_metrics,
-    parse_point,
-    parse_search,
-    parse_search_hits,
-    parse_upsert_point,
-)
-from .errors import AionBDError
-from .models import (
-    CollectionInfo,
-    DeleteCollectionResult,
-    DeletePointResult,
-    DistanceResult,
-    MetricsResult,
-    PointResult,
-    SearchResult,
-    UpsertPointResult,
+from ._endpoints import (
+    DEFAULT_BULK_CHUNK_SIZE,
+    EndpointMethods,
+    PointItem,
+    chunked_points,
 )
+from ._semantic_cache import SemanticCache, SemanticCacheConfig
+from ._transport import KeepAliveConnections, UrllibTransport
+from .models import UpsertPointResult
+
+
+class AionBDClient(EndpointMethods):
+    """Small HTTP client targeting the AIONBD server skeleton.
 
+    Connections are kept alive (one per calling thread) and reused across
+    calls; use the client as a context manager or call `close()` to release
+    them. Pass `keepalive=False` to open a fresh connection per request.
 
-class AionBDClient:
-    """Small HTTP client targeting the AIONBD server skeleton."""
+    With `semantic_cache=SemanticCacheConfig(...)`, unfiltered searches whose
+    query is a near-duplicate of a recent one are answered from memory; any
+    other non-GET call clears that cache.
+    """
 
     def __init__(
-        self, base_url: str = "http://127.0.0.1:8080", timeout: float = 5.0
+        self,
+        base_url: str = "http://127.0.0.1:8080",
+        timeout: float = 5.0,
+        keepalive: bool = True,
+        semantic_cache: SemanticCacheConfig | None = None,
     ) -> None:
         self._base_url = base_url.rstrip("/")
         self._timeout = timeout
-
-    def live(self) -> dict[str, Any]:
-        """Returns liveness and uptime metadata."""
-        payload = self._request("GET", "/live")
-        return payload if isinstance(payload, dict) else {"raw": payload}
-
-    def ready(self) -> dict[str, Any]:
-        """Returns readiness checks and uptime metadata."""
-        payload = self._request("GET", "/ready")
-        return payload if isinstance(payload, dict) else {"raw": payload}
-
-    def metrics(self) -> MetricsResult:
-        """Returns runtime counters and server state indicators."""
-        return parse_metrics(self._request("GET", "/metrics"))
-
-    def metrics_prometheus(self) -> str:
-        """Returns runtime counters in Prometheus text exposition format."""
-        return self._request("GET", "/metrics/prometheus", raw=True)
-
-    def health(self) -> dict[str, Any]:
-        """Backward-compatible alias using readiness endpoint."""
-        return self.ready()
-
-    def distance(
-        self, left: list[float], right: list[float], metric: str = "dot"
-    ) -> DistanceResult:
-        """Computes a distance/similarity value through the API."""
-        return parse_distance(
-            self._request(
-                "POST", "/distance", {"left": left, "right": right, "metric": metric}
-            )
-        )
-
-    def create_collection(
-        self, name: str, dimension: int, strict_finite: bool = True
-    ) -> CollectionInfo:
-        """Creates an in-memory collection."""
-        return parse_collection(
-            self._request(
-                "POST",
-                "/collections",
-                {"name": name, "dimension": dimension, "strict_finite": strict_finite},
-            )
+        transport = KeepAliveConnections if keepalive else UrllibTransport
+        self._transport = transport(self._base_url, timeout)
+        self._semantic_cache = (
+            SemanticCache(semantic_cache) if semantic_cache is not None else None
         )
 
-    def list_collections(self) -> list[CollectionInfo]:
-        """Lists all collections."""
-        payload = self._request("GET", "/collections")
-        try:
-            return [parse_collection(item) for item in payload["collections"]]
-        except (KeyError, TypeError) as exc:
-            raise AionBDError(f"invalid list collections response: {payload}") from exc
+    def __enter__(self) -> AionBDClient:
+        return self
 
-    def get_collection(self, name: str) -> CollectionInfo:
-        """Reads collection metadata."""
-        return parse_collection(
-            self._request("GET", f"/collections/{self._escaped(name)}")
-        )
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
-    def search_collection(
-        self,
-        collection: str,
-        query: list[float],
-        metric: str = "dot",
-        mode: str = "auto",
-        target_recall: float | None = None,
-        filter: dict[str, Any] | None = None,
-    ) -> SearchResult:
-        """Runs top-1 search in a collection using the selected metric."""
-        body: dict[str, Any] = {"query": query, "metric": metric, "mode": mode}
-        if target_recall is not None:
-            body["target_recall"] = float(target_recall)
-        if filter is not None:
-            body["filter"] = filter
+    def close(self) -> None:
+        """Closes keep-alive connections; a no-op for per-request connections."""
+        self._transport.close()
 
-        return parse_search(
-            self._request(
-                "POST",
-                f"/collections/{self._escaped(collection)}/search",
-                body,
-            )
-        )
+    def cache_stats(self) -> dict[str, int]:
+        """Returns semantic cache hits, misses and live entries (zeros if off)."""
+        if self._semantic_cache is None:
+            return {"hits": 0, "misses": 0, "entries": 0}
+        return self._semantic_cache.stats()
 
-    def search_collection_top_k(
+    def bulk_upsert_points(
         self,
         collection: str,
-        query: list[float],
-        limit: int | None = 10,
-        metric: str = "dot",
-        mode: str = "auto",
-        target_recall: float | None = None,
-        filter: dict[str, Any] | None = None,
-    ) -> list[SearchResult]:
-        """Runs top-k search in a collection using the selected metric.
-
-        Set `limit=None` to omit the field and let server defaults apply.
+        points: Iterable[PointItem],
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+    ) -> list[UpsertPointResult]:
+        """Upserts any number of points as batch requests of `chunk_size`.
+
+        `points` is consumed lazily, so a generator streams in bounded memory;
+        the per-point results are returned in input order. `chunk_size` must
+        not exceed the server's `AIONBD_UPSERT_BATCH_MAX_POINTS` (default 256);
+        if a chunk fails, earlier chunks stay committed.
         """
-        body: dict[str, Any] = {"query": query, "metric": metric, "mode": mode}
-        if limit is not None:
-            limit = int(limit)
-            if limit <= 0:
-                raise ValueError("limit must be > 0")
-            body["limit"] = limit
-        if target_recall is not None:
-            body["target_recall"] = float(target_recall)
-        if filter is not None:
-            body["filter"] = filter
+        return [
+            result
+            for chunk in chunked_points(points, chunk_size)
+            for result in self.upsert_points_batch(collection, chunk).results
+        ]
 
-        payload = self._request(
-            "POST", f"/collections/{self._escaped(collection)}/search/topk", body
-        )
-        return parse_search_hits(payload, mode_fallback=mode)
-
-    def upsert_point(
-        self,
-        collection: str,
-        point_id: int,
-        values: list[float],
-        payload: dict[str, Any] | None = None,
-    ) -> UpsertPointResult:
-        """Creates or updates a point in a collection."""
-        body: dict[str, Any] = {"values": values}
-        if payload is not None:
-            body["payload"] = payload
-        return parse_upsert_point(
-            self._request(
-                "PUT",
-                f"/collections/{self._escaped(collection)}/points/{point_id}",
-                body,
-            )
-        )
+    def iter_metrics_prometheus(self) -> Iterator[str]:
+        """Yields Prometheus exposition lines as they are received.
 
-    def get_point(self, collection: str, point_id: int) -> PointResult:
-        """Reads a point payload from a collection."""
-        return parse_point(
-            self._request(
-                "GET", f"/collections/{self._escaped(collection)}/points/{point_id}"
-            )
-        )
-
-    def list_points(
-        self,
-        collection: str,
-        offset: int = 0,
-        limit: int | None = 100,
-        after_id: int | None = None,
-    ) -> dict[str, Any]:
-        """Lists point ids with pagination metadata (offset or cursor mode).
-
-        Set `limit=None` to omit the query parameter and let server defaults apply.
+        Uses its own short-lived connection so the body is decoded and split
+        incrementally instead of being buffered into one string.
         """
-        if after_id is not None and offset != 0:
-            raise ValueError("offset must be 0 when after_id is provided")
-
-        params: list[str] = []
-        if limit is not None:
-            limit = int(limit)
-            if limit <= 0:
-                raise ValueError("limit must be > 0")
-            params.append(f"limit={limit}")
-
-        params.append(
-            f"offset={int(offset)}" if after_id is None else f"after_id={int(after_id)}"
-        )
-        return parse_list_points(
-            self._request(
-                "GET",
-                f"/collections/{self._escaped(collection)}/points?{'&'.join(params)}",
-            )
-        )
-
-    def delete_point(self, collection: str, point_id: int) -> DeletePointResult:
-        """Deletes a point from a collection."""
-        return parse_delete_point(
-            self._request(
-                "DELETE", f"/collections/{self._escaped(collection)}/points/{point_id}"
-            )
-        )
+        _, headers = self._encode_request(None, raw=True)
+        stream = UrllibTransport(self._base_url, self._timeout)
+        yield from stream.iter_lines("/metrics/prometheus", headers)
+
+    def iter_points(self, collection: str, page_size: int = 1000) -> Iterator[int]:
+        """Yields every point id, following `after_id` cursors page by page."""
+        points = self.collection(collection)
+        page = points.list_points(limit=page_size)
+        while True:
+            yield from page["points"]
+            after_id = page["next_after_id"]
+            if after_id is None:
+                return
+            page = points.list_points(limit=page_size, after_id=after_id)
+
+    def _call(
+        self,
+        method: str,
+        path: str,
+        body: dict[str, Any] | None,
+        parse: Callable[[Any], Any],
+        raw: bool = False,
+    ) -> Any:
+        if method != "GET" and self._semantic_cache is not None:
+            self._semantic_cache.clear()
+        return parse(self._request(method, path, body, raw=raw))
 
-    def delete_collection(self, name: str) -> DeleteCollectionResult:
-        """Deletes a collection."""
-        return parse_delete_collection(
-            self._request("DELETE", f"/collections/{self._escaped(name)}")
-        )
+    def _search(
+        self, path: str, body: dict[str, Any], parse: Callable[[Any], Any]
+    ) -> Any:
+        cache = self._semantic_cache
+        probe = cache.probe(path, body) if cache is not None else None
+        if probe is None:
+            return parse(self._request("POST", path, body))
+        cached = cache.lookup(*probe)
+        if cached is not None:
+            return cached
+        result = parse(self._request("POST", path, body))
+        cache.store(*probe, result)
+        return result
 
     def _request(
         self,
@@ -233,32 +132,6 @@ class AionBDClient:
         body: dict[str, Any] | None = None,
         raw: bool = False,
     ) -> Any:
-        data = None
-        headers = {"Accept": "text/plain" if raw else "application/json"}
-        if body is not None:
-            data = json.dumps(body).encode("utf-8")
-            headers["Content-Type"] = "application/json"
-
-        request = urllib.request.Request(
-            url=f"{self._base_url}{path}",
-            method=method,
-            data=data,
-            headers=headers,
-        )
-        try:
-            with urllib.request.urlopen(request, timeout=self._timeout) as response:
-                payload = response.read().decode("utf-8")
-                if raw:
-                    return payload
-                return {} if not payload else json.loads(payload)
-        except urllib.error.HTTPError as exc:
-            detail = exc.read().decode("utf-8", errors="replace")
-            raise AionBDError(f"HTTP {exc.code} on {method} {path}: {detail}") from exc
-        except urllib.error.URLError as exc:
-            raise AionBDError(
-                f"request failed for {method} {path}: {exc.reason}"
-            ) from exc
-
-    @staticmethod
-    def _escaped(value: str) -> str:
-        return urllib.parse.quote(value.strip(), safe="")
+        data, headers = self._encode_request(body, raw)
+        payload = self._transport.send(method, path, data, headers)
+        return self._decode_response(payload, raw)
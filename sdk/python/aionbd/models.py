@@ -2,11 +2,24 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Any
 
+__all__ = [
+    "DistanceResult",
+    "SearchResult",
+    "CollectionInfo",
+    "UpsertPointResult",
+    "UpsertPointsBatchResult",
+    "PointResult",
+    "MetricsResult",
+    "DeletePointResult",
+    "DeleteCollectionResult",
+]
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class DistanceResult:
     """Represents a distance operation response."""
 
@@ -14,7 +27,7 @@ class DistanceResult:
     value: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SearchResult:
     """Represents a top-1 collection search response."""
 
@@ -26,7 +39,7 @@ class SearchResult:
     payload: dict[str, Any] | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CollectionInfo:
     """Represents collection metadata returned by the server."""
 
@@ -36,7 +49,7 @@ class CollectionInfo:
     point_count: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UpsertPointResult:
     """Represents point upsert result."""
 
@@ -44,16 +57,29 @@ class UpsertPointResult:
     created: bool
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class UpsertPointsBatchResult:
+    """Represents batch point upsert result."""
+
+    created: int
+    updated: int
+    results: list[UpsertPointResult]
+
+
+@dataclass(frozen=True, slots=True)
 class PointResult:
-    """Represents a stored point payload."""
+    """Represents a stored point payload.
+
+    `values` is a `list[float]` unless `get_point(..., values_as=...)` asked for
+    a float32 `array('f')` or numpy array.
+    """
 
     id: int
-    values: list[float]
+    values: Sequence[float]
     payload: dict[str, Any]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MetricsResult:
     """Represents runtime server metrics payload."""
 
@@ -76,7 +102,7 @@ class MetricsResult:
     persistence_writes: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DeletePointResult:
     """Represents point delete result."""
 
@@ -84,7 +110,7 @@ class DeletePointResult:
     deleted: bool
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DeleteCollectionResult:
     """Represents collection delete result."""
 
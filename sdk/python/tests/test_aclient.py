@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from aionbd import AionBDError, AsyncAionBDClient
+from aionbd.aclient import httpx
+
+
+class _UpsertHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_PUT(self) -> None:  # noqa: N802
+        self.rfile.read(int(self.headers["Content-Length"]))
+        point_id = int(self.path.rsplit("/", 1)[1])
+        self._reply(200, {"id": point_id, "created": True})
+
+    def do_POST(self) -> None:  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        results = [{"id": point["id"], "created": True} for point in body["points"]]
+        self._reply(200, {"created": len(results), "updated": 0, "results": results})
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._reply(404, {"error": "not found"})
+
+    def _reply(self, status: int, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+
+class _PeakClient(AsyncAionBDClient):
+    """Records how many requests were awaiting a response at once."""
+
+    in_flight = 0
+    peak = 0
+
+    async def _request(self, *args: Any, **kwargs: Any) -> Any:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            return await super()._request(*args, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class AsyncClientTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _UpsertHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        host, port = self.server.server_address[:2]
+        self.base_url = f"http://{host}:{port}"
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    async def test_gathers_concurrent_upserts(self) -> None:
+        async with AsyncAionBDClient(self.base_url) as client:
+            results = await asyncio.gather(
+                *(client.upsert_point("demo", i, [1.0, 2.0]) for i in range(5))
+            )
+
+        self.assertEqual([result.id for result in results], [0, 1, 2, 3, 4])
+        self.assertTrue(all(result.created for result in results))
+
+    async def test_bulk_upsert_caps_in_flight_chunks(self) -> None:
+        points = ((i, [1.0, 2.0], None) for i in range(9))
+        async with _PeakClient(self.base_url, max_connections=2) as client:
+            results = await client.bulk_upsert_points("demo", points, chunk_size=2)
+
+        self.assertEqual([result.id for result in results], list(range(9)))
+        self.assertEqual(client.peak, 2)
+
+    async def test_maps_http_errors(self) -> None:
+        async with AsyncAionBDClient(self.base_url) as client:
+            with self.assertRaises(AionBDError) as ctx:
+                await client.get_collection("missing")
+
+        self.assertIn("HTTP 404 on GET /collections/missing", str(ctx.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import unittest
+from typing import Any
+
+from aionbd import AionBDClient
+
+
+class BatchEchoClient(AionBDClient):
+    def __init__(self) -> None:
+        super().__init__("http://unit.test")
+        self.batch_sizes: list[int] = []
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        body: dict[str, Any] | None = None,
+        raw: bool = False,
+    ) -> Any:
+        assert body is not None
+        points = body["points"]
+        self.batch_sizes.append(len(points))
+        return {
+            "created": len(points),
+            "updated": 0,
+            "results": [{"id": point["id"], "created": True} for point in points],
+        }
+
+
+class BulkUpsertTests(unittest.TestCase):
+    def test_streams_points_in_chunks(self) -> None:
+        client = BatchEchoClient()
+
+        results = client.bulk_upsert_points(
+            "demo", ((i, [1.0], None) for i in range(5)), chunk_size=2
+        )
+
+        self.assertEqual(client.batch_sizes, [2, 2, 1])
+        self.assertEqual([result.id for result in results], [0, 1, 2, 3, 4])
+
+    def test_default_chunks_fit_server_batch_cap(self) -> None:
+        client = BatchEchoClient()
+
+        client.bulk_upsert_points("demo", ((i, [1.0], None) for i in range(600)))
+
+        self.assertEqual(client.batch_sizes, [256, 256, 88])
+
+    def test_rejects_non_positive_chunk_size(self) -> None:
+        with self.assertRaises(ValueError):
+            BatchEchoClient().bulk_upsert_points("demo", [], chunk_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,20 +1,52 @@
 from __future__ import annotations
 
-import sys
+import dataclasses
+import json
+import threading
 import unittest
-from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Any
 
-sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
-
 from aionbd import AionBDClient, AionBDError, MetricsResult
 
+# Response fixtures shared by reference; the parsers never mutate them.
+_METRICS_PAYLOAD: dict[str, Any] = {
+    "uptime_ms": 42,
+    "ready": True,
+    "engine_loaded": True,
+    "storage_available": True,
+    "http_requests_total": 9,
+    "http_requests_in_flight": 1,
+    "http_responses_2xx_total": 8,
+    "http_responses_4xx_total": 1,
+    "http_requests_5xx_total": 0,
+    "http_request_duration_us_total": 2500,
+    "http_request_duration_us_max": 900,
+    "http_request_duration_us_avg": 277.78,
+    "collections": 3,
+    "points": 10,
+    "l2_indexes": 2,
+    "persistence_enabled": False,
+    "persistence_writes": 7,
+}
+_INVALID_LIMITS = (0, -1)
+_TOPK_PATH = "/collections/demo/search/topk"
+_POINTS_PATH = "/collections/demo/points"
+_TOPK_RESPONSE: dict[str, Any] = {"metric": "dot", "hits": [{"id": 1, "value": 0.5}]}
+_EMPTY_POINTS_RESPONSE: dict[str, Any] = {
+    "points": [],
+    "total": 0,
+    "next_offset": None,
+    "next_after_id": None,
+}
+
 
 class RecordingClient(AionBDClient):
     def __init__(self, response: Any) -> None:
-        super().__init__("http://unit.test")
-        self.calls: list[tuple[str, str, dict[str, Any] | None]] = []
-        self.raw_flags: list[bool] = []
+        # `_request` is stubbed, so skip the keep-alive pool's lock and
+        # thread-local setup.
+        super().__init__("http://unit.test", keepalive=False)
+        self.calls: list[tuple[str, str, dict[str, Any] | None, bool]] = []
         self._response = response
 
     def _request(
@@ -24,40 +56,34 @@ class RecordingClient(AionBDClient):
         body: dict[str, Any] | None = None,
         raw: bool = False,
     ) -> Any:
-        self.calls.append((method, path, body))
-        self.raw_flags.append(raw)
+        self.calls.append((method, path, body, raw))
         return self._response
 
 
 class SearchTopKRequestTests(unittest.TestCase):
     def test_omits_limit_when_none(self) -> None:
-        client = RecordingClient({"metric": "dot", "hits": [{"id": 1, "value": 0.5}]})
+        client = RecordingClient(_TOPK_RESPONSE)
 
         hits = client.search_collection_top_k(
             "demo", [1.0, 2.0], limit=None, metric="dot"
         )
 
         self.assertEqual(len(hits), 1)
-        self.assertEqual(len(client.calls), 1)
-        method, path, body = client.calls[0]
-        self.assertEqual(method, "POST")
-        self.assertEqual(path, "/collections/demo/search/topk")
-        self.assertEqual(body, {"query": [1.0, 2.0], "metric": "dot", "mode": "auto"})
+        body = {"query": [1.0, 2.0], "metric": "dot", "mode": "auto"}
+        self.assertEqual(client.calls, [("POST", _TOPK_PATH, body, False)])
 
     def test_includes_limit_when_provided(self) -> None:
-        client = RecordingClient({"metric": "dot", "hits": [{"id": 1, "value": 0.5}]})
+        client = RecordingClient(_TOPK_RESPONSE)
 
         client.search_collection_top_k("demo", [1.0, 2.0], limit=3, metric="dot")
 
-        _, _, body = client.calls[0]
-        self.assertEqual(
-            body, {"query": [1.0, 2.0], "metric": "dot", "mode": "auto", "limit": 3}
-        )
+        body = {"query": [1.0, 2.0], "metric": "dot", "mode": "auto", "limit": 3}
+        self.assertEqual(client.calls, [("POST", _TOPK_PATH, body, False)])
 
     def test_rejects_non_positive_limit(self) -> None:
-        client = RecordingClient({"metric": "dot", "hits": []})
+        client = RecordingClient(_TOPK_RESPONSE)
 
-        for invalid_limit in [0, -1]:
+        for invalid_limit in _INVALID_LIMITS:
             with self.subTest(limit=invalid_limit):
                 with self.assertRaises(ValueError):
                     client.search_collection_top_k(
@@ -81,9 +107,9 @@ class ListPointsRequestTests(unittest.TestCase):
         self.assertEqual(payload["points"], [1, 2])
         self.assertEqual(payload["next_offset"], 2)
         self.assertEqual(payload["next_after_id"], 2)
-        _, path, _ = client.calls[0]
-        self.assertEqual(path, "/collections/demo/points?offset=0")
-        self.assertNotIn("limit=", path)
+        self.assertEqual(
+            client.calls, [("GET", f"{_POINTS_PATH}?offset=0", None, False)]
+        )
 
     def test_omits_limit_when_none_and_uses_cursor_mode(self) -> None:
         client = RecordingClient(
@@ -97,34 +123,29 @@ class ListPointsRequestTests(unittest.TestCase):
 
         client.list_points("demo", limit=None, after_id=2)
 
-        _, path, _ = client.calls[0]
-        self.assertEqual(path, "/collections/demo/points?after_id=2")
-        self.assertNotIn("limit=", path)
+        self.assertEqual(
+            client.calls, [("GET", f"{_POINTS_PATH}?after_id=2", None, False)]
+        )
 
     def test_includes_limit_when_provided(self) -> None:
-        client = RecordingClient(
-            {"points": [], "total": 0, "next_offset": None, "next_after_id": None}
-        )
+        client = RecordingClient(_EMPTY_POINTS_RESPONSE)
 
         client.list_points("demo", offset=3, limit=50)
 
-        _, path, _ = client.calls[0]
-        self.assertEqual(path, "/collections/demo/points?limit=50&offset=3")
+        self.assertEqual(
+            client.calls, [("GET", f"{_POINTS_PATH}?limit=50&offset=3", None, False)]
+        )
 
     def test_rejects_non_positive_limit(self) -> None:
-        client = RecordingClient(
-            {"points": [], "total": 0, "next_offset": None, "next_after_id": None}
-        )
+        client = RecordingClient(_EMPTY_POINTS_RESPONSE)
 
-        for invalid_limit in [0, -1]:
+        for invalid_limit in _INVALID_LIMITS:
             with self.subTest(limit=invalid_limit):
                 with self.assertRaises(ValueError):
                     client.list_points("demo", limit=invalid_limit)
 
     def test_rejects_mixed_offset_and_after_id(self) -> None:
-        client = RecordingClient(
-            {"points": [], "total": 0, "next_offset": None, "next_after_id": None}
-        )
+        client = RecordingClient(_EMPTY_POINTS_RESPONSE)
 
         with self.assertRaises(ValueError):
             client.list_points("demo", offset=1, after_id=2)
@@ -138,10 +159,31 @@ class PointPayloadTests(unittest.TestCase):
 
         self.assertEqual(result.id, 7)
         self.assertTrue(result.created)
-        method, path, body = client.calls[0]
-        self.assertEqual(method, "PUT")
-        self.assertEqual(path, "/collections/demo/points/7")
-        self.assertEqual(body, {"values": [1.0, 2.0], "payload": {"tenant": "edge"}})
+        body = {"values": [1.0, 2.0], "payload": {"tenant": "edge"}}
+        self.assertEqual(client.calls, [("PUT", f"{_POINTS_PATH}/7", body, False)])
+
+    def test_upsert_points_batch_posts_all_points(self) -> None:
+        client = RecordingClient(
+            {
+                "created": 1,
+                "updated": 1,
+                "results": [{"id": 1, "created": True}, {"id": 2, "created": False}],
+            }
+        )
+
+        result = client.upsert_points_batch(
+            "demo", [(1, [1.0, 2.0], {"tenant": "edge"}), (2, [3.0, 4.0], None)]
+        )
+
+        self.assertEqual((result.created, result.updated), (1, 1))
+        self.assertEqual([item.id for item in result.results], [1, 2])
+        batch = {
+            "points": [
+                {"id": 1, "values": [1.0, 2.0], "payload": {"tenant": "edge"}},
+                {"id": 2, "values": [3.0, 4.0]},
+            ]
+        }
+        self.assertEqual(client.calls, [("POST", _POINTS_PATH, batch, False)])
 
     def test_get_point_parses_payload(self) -> None:
         client = RecordingClient(
@@ -157,47 +199,18 @@ class PointPayloadTests(unittest.TestCase):
 
 class MetricsRequestTests(unittest.TestCase):
     def test_metrics_calls_endpoint_and_parses_response(self) -> None:
-        client = RecordingClient(
-            {
-                "uptime_ms": 42,
-                "ready": True,
-                "engine_loaded": True,
-                "storage_available": True,
-                "http_requests_total": 9,
-                "http_requests_in_flight": 1,
-                "http_responses_2xx_total": 8,
-                "http_responses_4xx_total": 1,
-                "http_requests_5xx_total": 0,
-                "http_request_duration_us_total": 2500,
-                "http_request_duration_us_max": 900,
-                "http_request_duration_us_avg": 277.78,
-                "collections": 3,
-                "points": 10,
-                "l2_indexes": 2,
-                "persistence_enabled": False,
-                "persistence_writes": 7,
-            }
-        )
+        client = RecordingClient(_METRICS_PAYLOAD)
 
         metrics = client.metrics()
 
         self.assertIsInstance(metrics, MetricsResult)
-        self.assertEqual(metrics.collections, 3)
-        self.assertEqual(metrics.points, 10)
-        self.assertEqual(metrics.persistence_writes, 7)
-        self.assertTrue(metrics.ready)
-        self.assertEqual(metrics.http_requests_total, 9)
-        self.assertEqual(metrics.http_requests_in_flight, 1)
-        self.assertEqual(metrics.http_responses_2xx_total, 8)
-        self.assertEqual(metrics.http_responses_4xx_total, 1)
-        self.assertEqual(metrics.http_requests_5xx_total, 0)
-        self.assertEqual(metrics.http_request_duration_us_total, 2500)
-        self.assertEqual(metrics.http_request_duration_us_max, 900)
-        self.assertAlmostEqual(metrics.http_request_duration_us_avg, 277.78, places=2)
-        method, path, body = client.calls[0]
-        self.assertEqual(method, "GET")
-        self.assertEqual(path, "/metrics")
-        self.assertIsNone(body)
+        parsed = dataclasses.asdict(metrics)
+        avg = parsed.pop("http_request_duration_us_avg")
+        expected = dict(_METRICS_PAYLOAD)
+        del expected["http_request_duration_us_avg"]
+        self.assertEqual(parsed, expected)
+        self.assertAlmostEqual(avg, 277.78, places=2)
+        self.assertEqual(client.calls, [("GET", "/metrics", None, False)])
 
     def test_metrics_rejects_invalid_payload(self) -> None:
         client = RecordingClient({"uptime_ms": 42})
@@ -211,11 +224,51 @@ class MetricsRequestTests(unittest.TestCase):
         payload = client.metrics_prometheus()
 
         self.assertEqual(payload, "aionbd_collections 3\n")
-        method, path, body = client.calls[0]
-        self.assertEqual(method, "GET")
-        self.assertEqual(path, "/metrics/prometheus")
-        self.assertIsNone(body)
-        self.assertEqual(client.raw_flags, [True])
+        self.assertEqual(client.calls, [("GET", "/metrics/prometheus", None, True)])
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        self.server.peers.add(self.client_address)  # type: ignore[attr-defined]
+        status = 404 if self.path == "/missing" else 200
+        body = json.dumps({"status": "ok", "path": self.path}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+
+class KeepAliveTransportTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+        self.server.peers = set()  # type: ignore[attr-defined]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        host, port = self.server.server_address[:2]
+        self.client = AionBDClient(f"http://{host}:{port}", keepalive=True)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_reuses_one_connection_across_requests(self) -> None:
+        for _ in range(3):
+            self.assertEqual(self.client.live(), {"status": "ok", "path": "/live"})
+
+        self.assertEqual(len(self.server.peers), 1)  # type: ignore[attr-defined]
+
+    def test_maps_http_errors(self) -> None:
+        with self.assertRaises(AionBDError) as ctx:
+            self.client._request("GET", "/missing")
+
+        self.assertIn("HTTP 404 on GET /missing", str(ctx.exception))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import json
+import unittest
+from array import array
+from unittest import mock
+
+from aionbd import _codec
+
+
+class DumpsTests(unittest.TestCase):
+    def test_serializes_array_vectors(self) -> None:
+        body = {"values": array("d", [1.0, 2.5])}
+
+        self.assertEqual(json.loads(_codec.dumps(body)), {"values": [1.0, 2.5]})
+
+    def test_stdlib_fallback_serializes_array_vectors(self) -> None:
+        with mock.patch.object(_codec, "orjson", None):
+            data = _codec.dumps({"values": array("f", [0.5])})
+
+        self.assertEqual(json.loads(data), {"values": [0.5]})
+
+    def test_rejects_unserializable_values(self) -> None:
+        with self.assertRaises(TypeError):
+            _codec.dumps({"values": object()})
+
+
+if __name__ == "__main__":
+    unittest.main()
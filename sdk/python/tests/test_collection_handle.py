@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import unittest
+from typing import Any
+
+from aionbd import AionBDClient
+
+
+class PathRecordingClient(AionBDClient):
+    def __init__(self) -> None:
+        super().__init__("http://unit.test")
+        self.calls: list[tuple[str, str]] = []
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        body: dict[str, Any] | None = None,
+        raw: bool = False,
+    ) -> Any:
+        self.calls.append((method, path))
+        return {"id": 7, "created": True, "deleted": True}
+
+
+class CollectionHandleTests(unittest.TestCase):
+    def test_handle_reuses_escaped_prefix(self) -> None:
+        client = PathRecordingClient()
+        handle = client.collection(" team/a ")
+
+        handle.upsert_point(7, [1.0])
+        handle.delete_point(7)
+
+        self.assertEqual(handle.path, "/collections/team%2Fa")
+        self.assertEqual(
+            client.calls,
+            [
+                ("PUT", "/collections/team%2Fa/points/7"),
+                ("DELETE", "/collections/team%2Fa/points/7"),
+            ],
+        )
+
+    def test_flat_methods_match_handle_paths(self) -> None:
+        client = PathRecordingClient()
+
+        client.upsert_point(" team/a ", 7, [1.0])
+
+        self.assertEqual(client.calls, [("PUT", "/collections/team%2Fa/points/7")])
+
+
+class PagedClient(AionBDClient):
+    def __init__(self) -> None:
+        super().__init__("http://unit.test")
+        self.paths: list[str] = []
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        body: dict[str, Any] | None = None,
+        raw: bool = False,
+    ) -> Any:
+        self.paths.append(path)
+        start = int(path.rsplit("=", 1)[1]) + ("after_id" in path)
+        points = [{"id": i} for i in range(start, min(start + 2, 5))]
+        last = points[-1]["id"]
+        return {
+            "points": points,
+            "total": 5,
+            "next_offset": None,
+            "next_after_id": last if last < 4 else None,
+        }
+
+
+class IterPointsTests(unittest.TestCase):
+    def test_follows_cursor_pages(self) -> None:
+        client = PagedClient()
+
+        self.assertEqual(list(client.iter_points("demo", page_size=2)), [0, 1, 2, 3, 4])
+        self.assertEqual(
+            client.paths,
+            [
+                "/collections/demo/points?limit=2&offset=0",
+                "/collections/demo/points?limit=2&after_id=1",
+                "/collections/demo/points?limit=2&after_id=3",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
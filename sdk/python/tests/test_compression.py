@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from aionbd import AionBDClient
+
+
+class _GzipHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path == "/metrics/prometheus":
+            body = b"# TYPE up gauge\nup 1\n"
+        else:
+            body = json.dumps({"status": "ok"}).encode("utf-8")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+
+class GzipResponseTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _GzipHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        host, port = self.server.server_address[:2]
+        self.base_url = f"http://{host}:{port}"
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_decodes_gzip_responses_on_both_transports(self) -> None:
+        for keepalive in (True, False):
+            with AionBDClient(self.base_url, keepalive=keepalive) as client:
+                self.assertEqual(client.live(), {"status": "ok"})
+
+    def test_streams_prometheus_lines(self) -> None:
+        with AionBDClient(self.base_url) as client:
+            lines = list(client.iter_metrics_prometheus())
+
+        self.assertEqual(lines, ["# TYPE up gauge", "up 1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
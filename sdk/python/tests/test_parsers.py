@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import unittest
+from array import array
+
+from aionbd import AionBDError, SearchResult
+from aionbd._parsers import check_point_values_format, parse_point, parse_search_hits
+
+
+class ParsePointTests(unittest.TestCase):
+    def test_values_default_to_float_list(self) -> None:
+        point = parse_point({"id": 5, "values": [1, 2.5]})
+
+        self.assertEqual(point.values, [1.0, 2.5])
+        self.assertEqual(point.payload, {})
+
+    def test_values_as_array(self) -> None:
+        point = parse_point({"id": 5, "values": [1, 2.5]}, values_as="array")
+
+        self.assertEqual(point.values, array("f", [1.0, 2.5]))
+
+    def test_rejects_non_numeric_values(self) -> None:
+        with self.assertRaises(AionBDError):
+            parse_point({"id": 5, "values": ["x"]}, values_as="array")
+
+    def test_rejects_unknown_values_format(self) -> None:
+        with self.assertRaises(ValueError):
+            check_point_values_format("tuple")
+
+
+class ParseSearchHitsTests(unittest.TestCase):
+    def test_hits_equal_constructed_results(self) -> None:
+        payload = {
+            "metric": "dot",
+            "recall_at_k": 1,
+            "hits": [{"id": 3, "value": 2, "payload": {"a": 1}}],
+        }
+
+        hits = parse_search_hits(payload, mode_fallback="exact")
+
+        self.assertEqual(hits, [SearchResult(3, "dot", 2.0, "exact", 1.0, {"a": 1})])
+        self.assertIsInstance(hits[0].value, float)
+
+
+if __name__ == "__main__":
+    unittest.main()
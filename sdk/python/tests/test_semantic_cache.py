@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import unittest
+from typing import Any
+
+from aionbd import AionBDClient, SemanticCacheConfig
+
+
+class CountingClient(AionBDClient):
+    def __init__(self) -> None:
+        super().__init__("http://unit.test", semantic_cache=SemanticCacheConfig())
+        self.paths: list[str] = []
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        body: dict[str, Any] | None = None,
+        raw: bool = False,
+    ) -> Any:
+        self.paths.append(path)
+        if path.endswith("/search"):
+            return {"id": len(self.paths), "metric": "dot", "value": 1.0}
+        return {"id": 1, "created": True}
+
+
+class SemanticCacheTests(unittest.TestCase):
+    def test_near_duplicate_query_is_served_from_cache(self) -> None:
+        client = CountingClient()
+
+        first = client.search_collection("demo", [1.0, 2.0])
+        second = client.search_collection("demo", [1.0, 2.001])
+        other = client.search_collection("demo", [2.0, -1.0])
+
+        self.assertEqual(second, first)
+        self.assertNotEqual(other, first)
+        self.assertEqual(len(client.paths), 2)
+        self.assertEqual(client.cache_stats(), {"hits": 1, "misses": 2, "entries": 2})
+
+    def test_filtered_search_bypasses_cache(self) -> None:
+        client = CountingClient()
+        query_filter = {"must": [{"field": "tenant", "value": "edge"}]}
+
+        client.search_collection("demo", [1.0, 2.0], filter=query_filter)
+        client.search_collection("demo", [1.0, 2.0], filter=query_filter)
+
+        self.assertEqual(len(client.paths), 2)
+
+    def test_writes_clear_cache(self) -> None:
+        client = CountingClient()
+
+        client.search_collection("demo", [1.0, 2.0])
+        client.upsert_point("demo", 1, [1.0, 2.0])
+        client.search_collection("demo", [1.0, 2.0])
+
+        self.assertEqual(len(client.paths), 3)
+
+    def test_rejects_invalid_threshold(self) -> None:
+        with self.assertRaises(ValueError):
+            SemanticCacheConfig(threshold=1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()